@@ -0,0 +1,339 @@
+"""Assemble a program one section at a time.
+
+A program is divided into sections by `.section <id>` directives. Section
+0, where a file starts, is for the definitions shared by every unit.
+Sections 1 to NUM_OF_UNITS hold the code of each unit. They do not
+depend on each other, so after a quick pre-scan splits the source into
+sections, each unit section is parsed, validated and converted on its
+own, possibly in a separate process. The results are always put back in
+section order.
+
+`.include <file>` splices the lines of another file in, as if they were
+written in its place, so a .section in the included file carries on
+after it.
+"""
+
+
+__all__ = [
+    'AssemblyError',
+    'assemble_file',
+    'assemble_section',
+    'assemble_sections',
+    'prescan',
+    'Section',
+    'SectionResult',
+    'write_listing',
+    ]
+
+
+from concurrent.futures import ProcessPoolExecutor
+import io
+from pathlib import Path
+
+from defines import NUM_OF_UNITS
+from encoder import (
+    EncodingError,
+    SectionEncoder,
+    )
+import grammar
+from includes import (
+    IncludeManager,
+    scan_buffer,
+    )
+import instrument
+from labels import (
+    Fixup,
+    resolve_fixups,
+    )
+from op_code import SECTION_OPS
+import syntax
+import writer
+
+
+SECTION_DIRECTIVE = b'.section'
+INCLUDE_DIRECTIVE = b'.include'
+
+
+class AssemblyError(Exception):
+    """An error in the program being assembled.
+
+    The last two arguments are the path of the file and the line number
+    the error is on, if it is on a line.
+    """
+
+
+class Section:
+    """The code of one section, as found by the pre-scan.
+
+    id: The section number, 0 for the shared section.
+    lines: The code of each non-blank line, as bytes without comments.
+    line_numbers: The source line number of each entry in lines.
+    paths: The file each entry in lines is from, lines spliced in from
+        an included file have its path.
+    """
+
+    __slots__ = ('id', 'lines', 'line_numbers', 'paths')
+
+    def __init__(self, id):
+        self.id = id
+        self.lines = []
+        self.line_numbers = []
+        self.paths = []
+
+    def add_line(self, line_number, code, path=None):
+        self.lines.append(code)
+        self.line_numbers.append(line_number)
+        self.paths.append(path)
+
+    def location(self, index):
+        """Get the (path, line number) that lines[index] is from."""
+        return self.paths[index], self.line_numbers[index]
+
+    def __getstate__(self):
+        return (self.id, self.lines, self.line_numbers, self.paths)
+
+    def __setstate__(self, state):
+        self.id, self.lines, self.line_numbers, self.paths = state
+
+
+class SectionResult:
+    """The assembled form of a section.
+
+    id: The section number.
+    listing: The text of each instruction, normalized.
+    code: The machine code of the section, as bytes.
+    labels: Mapping from each label defined in the section to its address.
+    fixups: A labels.Fixup for each identifier used in the code.
+    """
+
+    __slots__ = ('id', 'listing', 'code', 'labels', 'fixups')
+
+    def __init__(self, id, listing, code, labels=None, fixups=None):
+        self.id = id
+        self.listing = listing
+        self.code = code
+        self.labels = labels if labels is not None else {}
+        self.fixups = fixups if fixups is not None else []
+
+    def __getstate__(self):
+        return (self.id, self.listing, self.code, self.labels, self.fixups)
+
+    def __setstate__(self, state):
+        self.id, self.listing, self.code, self.labels, self.fixups = state
+
+
+def prescan(buffer, includes=None):
+    """Split a source file into its sections.
+
+    Only directives are interpreted here, the rest of each line is left
+    for assemble_section. An included file is spliced in where it is
+    included.
+
+    buffer: A lines.SourceBuffer of the source file.
+    includes: The includes.IncludeManager to read included files with.
+    return: A list of every Section, indexed by id.
+    """
+    if includes is None:
+        includes = IncludeManager()
+    sections = [Section(id) for id in range(NUM_OF_UNITS + 1)]
+    path = Path(buffer.path).resolve()
+    includes.enter(path)
+    try:
+        _prescan_entries(scan_buffer(buffer), path, sections, sections[0],
+                         includes)
+    finally:
+        includes.leave(path)
+    return sections
+
+
+def _prescan_entries(entries, path, sections, current, includes):
+    file_name = str(path)
+    for line_number, code in entries:
+        if not code.startswith(b'.'):
+            current.add_line(line_number, code, file_name)
+            continue
+        location = (file_name, line_number)
+        parts = code.split(None, 1)
+        if parts[0] == SECTION_DIRECTIVE:
+            current = sections[parse_section_directive(code, location)]
+        elif parts[0] == INCLUDE_DIRECTIVE:
+            name = parse_include_directive(code, location)
+            with includes.include(name, path) as included:
+                current = _prescan_entries(includes.scan(included), included,
+                                           sections, current, includes)
+        else:
+            raise AssemblyError('Unknown directive', parts[0].decode(
+                errors='replace'), *location)
+    return current
+
+
+def parse_include_directive(code, location):
+    """Get the file name an include directive names.
+
+    location: The (path, line number) of the directive, for errors.
+    """
+    parts = code.split(None, 1)
+    name = parts[1].strip().strip(b'"') if 1 < len(parts) else b''
+    if not name:
+        raise AssemblyError('Expected a file name', *location)
+    return name.decode()
+
+
+def parse_section_directive(code, location):
+    """Get the section number a section directive names.
+
+    location: The (path, line number) of the directive, for errors.
+    """
+    parts = code.split()
+    if len(parts) != 2 or not parts[1].isdigit():
+        raise AssemblyError('Expected a section number', *location)
+    id = int(parts[1])
+    if NUM_OF_UNITS < id:
+        raise AssemblyError('Section number out of range', id, *location)
+    return id
+
+
+def iter_section_trees(section):
+    """Parse each line of a section in a single stream.
+
+    The lines are joined into one buffer, as a section can take lines
+    from several files and has to be sent to other processes. Every line
+    has code on it, so each gives one tree, and an error from the lexer
+    or parser is on the line after the last tree produced. It is raised
+    as an AssemblyError naming that line.
+    """
+    trees = grammar.iter_parse_buffer(b'\n'.join(section.lines))
+    index = 0
+    try:
+        for tree in trees:
+            yield tree
+            index += 1
+    except KeyError as error:
+        state, symbol = error.args
+        raise AssemblyError('Unexpected symbol', symbol.name, section.id,
+                            *section.location(index)) from error
+    except Exception as error:
+        raise AssemblyError(*error.args, section.id,
+                            *section.location(index)) from error
+
+
+def assemble_section(section):
+    """Parse, validate and encode the instructions in a section.
+
+    return: The SectionResult for section.
+    """
+    if section.id == 0 and section.lines:
+        raise AssemblyError('Instructions must be in a unit section',
+                            *section.location(0))
+    allowed = SECTION_OPS[section.id]
+    listing = []
+    labels = {}
+    encoder = SectionEncoder()
+    trees = iter_section_trees(section)
+    if instrument.enabled():
+        # Run each phase over the whole section, so they can be timed.
+        with instrument.phase('parse'):
+            trees = list(trees)
+        with instrument.phase('syntax'):
+            nodes = list(map(syntax.to_node, trees))
+    else:
+        nodes = map(syntax.to_node, trees)
+    with instrument.phase('encode'):
+        _encode_nodes(section, nodes, allowed, listing, labels, encoder)
+    fixups = [Fixup(section.id, *fixup) for fixup in encoder.fixups]
+    return SectionResult(section.id, listing, encoder.to_bytes(),
+                         labels, fixups)
+
+
+def _encode_nodes(section, nodes, allowed, listing, labels, encoder):
+    for index, node in enumerate(nodes):
+        if node.label is not None:
+            if node.label in labels:
+                raise AssemblyError('Label defined twice', node.label,
+                                    *section.location(index))
+            labels[node.label] = len(encoder)
+        listing.append(str(node))
+        if isinstance(node, syntax.LabelNode):
+            continue
+        op_data = node.op_data
+        name = op_data.name
+        if not allowed >> op_data.index & 1:
+            raise AssemblyError('Operation not allowed in section',
+                                name, section.id, *section.location(index))
+        try:
+            encoder.add(op_data, node.args)
+        except EncodingError as error:
+            raise AssemblyError(*error.args, name,
+                                *section.location(index)) from error
+
+
+def _assemble_each(sections, jobs):
+    if jobs == 1 or len(sections) < 2 or instrument.enabled():
+        return [assemble_section(section) for section in sections]
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(assemble_section, sections))
+
+
+def assemble_sections(sections, jobs=1, section_cache=None):
+    """Assemble every section, in parallel if jobs is more than 1, then
+    resolve the labels used across them.
+
+    jobs: Number of worker processes, None to use every processor.
+        Sections are assembled in this process while instrument is
+        recording.
+    section_cache: An incremental.SectionCache. Sections found in it are
+        not assembled again, the rest are added to it.
+    return: The SectionResult of each section, in the order given.
+    """
+    if section_cache is None:
+        results = _assemble_each(sections, jobs)
+    else:
+        results = [section_cache.get(section) for section in sections]
+        changed = [section for section, result in zip(sections, results)
+                   if result is None]
+        assembled = iter(_assemble_each(changed, jobs))
+        for index, result in enumerate(results):
+            if result is None:
+                results[index] = result = next(assembled)
+                section_cache.add(sections[index], result)
+    with instrument.phase('resolve'):
+        resolve_fixups(results)
+    return results
+
+
+def write_listing(results, file):
+    """Write the assembled sections as text, one instruction a line."""
+    for result in results:
+        if result.listing:
+            file.write('.section {}\n'.format(result.id))
+            for line in result.listing:
+                file.write(line + '\n')
+
+
+def assemble_file(source, output_path, jobs=1, section_cache=None,
+                  listing_path=None, verify_as=None, includes=None):
+    """Assemble a source file and write its image to output_path.
+
+    source: The lines.SourceFile to assemble.
+    section_cache: The incremental.SectionCache to reuse sections from.
+    listing_path: If given, also write the listing to this file.
+    verify_as: If given, the as compiler to check the image against.
+    includes: The includes.IncludeManager to read included files with.
+    return: The SectionResult of each section.
+    """
+    with instrument.source_file(source.path):
+        with instrument.phase('prescan'), source.open_buffer() as buffer:
+            sections = prescan(buffer, includes)
+        results = assemble_sections(sections, jobs, section_cache)
+        with instrument.phase('write'), open(str(output_path), 'wb') as file:
+            writer.write_image(results, file)
+    if listing_path is not None or verify_as is not None:
+        listing = io.StringIO()
+        write_listing(results, listing)
+        if listing_path is not None:
+            with open(str(listing_path), 'w') as file:
+                file.write(listing.getvalue())
+        if verify_as is not None:
+            writer.verify_with_as(listing.getvalue(),
+                                  writer.image_bytes(results), verify_as)
+    return results
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""Assemble many programs in one process.
+
+Starting the interpreter and loading the grammar and operation tables
+costs more than assembling a typical program, and programs often include
+the same headers. So when there are many programs to assemble (every bot
+submitted to a tournament, say) this pays those costs once for the whole
+batch, or once per worker process when run with --jobs.
+
+Sources are given as file names or glob patterns on the command line,
+or listed in a manifest file, one per line, optionally followed by the
+output file name. Blank lines and lines starting with # are ignored.
+Names in a manifest are relative to the manifest's directory. Output
+directories are created as needed. If two sources would be written to
+the same output file, nothing is assembled.
+
+A summary with the time spent on each file is written at the end, to
+stderr or the --summary file.
+"""
+
+
+__all__ = [
+    'assemble_batch',
+    'duplicate_outputs',
+    'FileResult',
+    'read_manifest',
+    ]
+
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import glob
+from pathlib import Path
+import sys
+import time
+
+from assembler import assemble_file
+from includes import IncludeManager
+from lines import SourceFile
+
+
+OUTPUT_SUFFIX = '.out'
+
+
+# Shared by every file assembled in this process, so headers included by
+# many of them are only read once.
+_includes = IncludeManager()
+
+
+class FileResult:
+    """The outcome of assembling one file of a batch.
+
+    error: None if the file was assembled, otherwise a description of
+        what went wrong.
+    """
+
+    __slots__ = ('source', 'output', 'seconds', 'instructions', 'error')
+
+    def __init__(self, source, output, seconds, instructions, error=None):
+        self.source = source
+        self.output = output
+        self.seconds = seconds
+        self.instructions = instructions
+        self.error = error
+
+    def __getstate__(self):
+        return (self.source, self.output, self.seconds, self.instructions,
+                self.error)
+
+    def __setstate__(self, state):
+        (self.source, self.output, self.seconds, self.instructions,
+         self.error) = state
+
+
+def read_manifest(path):
+    """Read the (source, output) pairs from a manifest file.
+
+    output is None if the line does not give one.
+    """
+    path = Path(path)
+    pairs = []
+    with path.open() as file:
+        for line in file:
+            parts = line.split()
+            if not parts or parts[0].startswith('#'):
+                continue
+            if 2 < len(parts):
+                raise Exception('Manifest line has too many names', line)
+            source = Path(path.parent, parts[0])
+            output = Path(path.parent, parts[1]) if 1 < len(parts) else None
+            pairs.append((source, output))
+    return pairs
+
+
+def expand_patterns(patterns):
+    """Get the source files matched by each name or glob pattern.
+
+    Names that don't match anything are kept, so they are reported as
+    missing instead of quietly skipped.
+    """
+    seen = set()
+    sources = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern, recursive=True)) or [pattern]
+        for match in matches:
+            if match not in seen:
+                seen.add(match)
+                sources.append(Path(match))
+    return sources
+
+
+def default_output(source, output_dir=None):
+    """Get the output file for a source, in output_dir if given and
+    beside the source otherwise."""
+    directory = source.parent if output_dir is None else Path(output_dir)
+    return Path(directory, source.stem + OUTPUT_SUFFIX)
+
+
+def duplicate_outputs(pairs):
+    """Find the (source, output) pairs that write to the same output file
+    as an earlier pair.
+
+    return: A (source, output, earlier source) tuple for each.
+    """
+    writers = {}
+    duplicates = []
+    for source, output in pairs:
+        key = Path(output).resolve()
+        if key in writers:
+            duplicates.append((source, output, writers[key]))
+        else:
+            writers[key] = source
+    return duplicates
+
+
+def assemble_one(pair):
+    """Assemble a single (source, output) pair, recording any error."""
+    source, output = pair
+    begin = time.perf_counter()
+    try:
+        Path(output).parent.mkdir(parents=True, exist_ok=True)
+        results = assemble_file(SourceFile(Path(source).resolve()), output,
+                                includes=_includes)
+    except Exception as error:
+        return FileResult(source, output, time.perf_counter() - begin, 0,
+                          '{}: {}'.format(type(error).__name__, error))
+    instructions = sum(len(result.listing) for result in results)
+    return FileResult(source, output, time.perf_counter() - begin,
+                      instructions)
+
+
+def assemble_batch(pairs, jobs=1):
+    """Assemble each (source, output) pair.
+
+    jobs: Number of worker processes, None to use every processor.
+        Each file is assembled by a single process.
+    return: A FileResult for each pair, in the same order.
+    """
+    if jobs == 1:
+        return [assemble_one(pair) for pair in pairs]
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(assemble_one, pairs, chunksize=8))
+
+
+def write_summary(results, elapsed, file):
+    """Write the time taken on each file, then the totals."""
+    for result in results:
+        status = 'ok' if result.error is None else 'FAILED'
+        file.write('{:9.4f}s {:8d} {:6} {}\n'.format(
+            result.seconds, result.instructions, status, result.source))
+        if result.error is not None:
+            file.write('    {}\n'.format(result.error))
+    failed = sum(1 for result in results if result.error is not None)
+    file.write('{} files, {} failed, {} instructions in {:.3f}s\n'.format(
+        len(results), failed,
+        sum(result.instructions for result in results), elapsed))
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    pairs = []
+    if args.manifest is not None:
+        for source, output in read_manifest(args.manifest):
+            if output is None:
+                output = default_output(source, args.output_dir)
+            pairs.append((source, output))
+    for source in expand_patterns(args.sources):
+        pairs.append((source, default_output(source, args.output_dir)))
+    duplicates = duplicate_outputs(pairs)
+    for source, output, first in duplicates:
+        sys.stderr.write('{} and {} are both written to {}\n'.format(
+            first, source, output))
+    if duplicates:
+        return 1
+
+    begin = time.perf_counter()
+    results = assemble_batch(pairs, args.jobs)
+    elapsed = time.perf_counter() - begin
+    if args.summary is None:
+        write_summary(results, elapsed, sys.stderr)
+    else:
+        with open(args.summary, 'w') as file:
+            write_summary(results, elapsed, file)
+    return 1 if any(result.error is not None for result in results) else 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Assemble many source files in one process.')
+    parser.add_argument('sources', nargs='*',
+        help='Source files or glob patterns to assemble.')
+    parser.add_argument('-m', '--manifest',
+        help='File listing the sources (and outputs) to assemble.')
+    parser.add_argument('-o', '--output-dir',
+        help='Directory to write outputs to, instead of beside each'
+             ' source.')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+        help='Number of processes to assemble files with, 0 for one'
+             ' per processor.')
+    parser.add_argument('--summary',
+        help='File to write the timing summary to, instead of stderr.')
+    args = parser.parse_args(argv)
+    if args.jobs == 0:
+        args.jobs = None
+    if not args.sources and args.manifest is None:
+        parser.error('no sources or manifest given')
+    return args
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,9 @@
+"""Benchmarks for the Python implementation of Recruiter.
+
+Run them as modules from the python directory, for example:
+
+    python3 -m benchmarks.bench_slr1
+
+benchmarks.run is the overall throughput suite, reporting lines per
+second and peak memory on programs made by benchmarks.generate as JSON.
+"""
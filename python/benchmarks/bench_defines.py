@@ -0,0 +1,86 @@
+"""Compare Defines look ups against the old ChainMap layout.
+
+Fills the shared section and every unit section with labels, then times
+looking every one of them up from each unit section.
+
+    python3 -m benchmarks.bench_defines [--names N] [--repeat N]
+"""
+
+
+import argparse
+from collections import ChainMap
+import time
+
+from defines import (
+    Defines,
+    NUM_OF_UNITS,
+    )
+
+
+class ChainMapDefines:
+    """Defines as it was, with each unit section a child of section 0."""
+
+    def __init__(self):
+        self.section_defines = [ChainMap({})]
+        self.section_defines.extend(
+            self.section_defines[0].new_child() for _ in range(NUM_OF_UNITS))
+        self.current_section_define = self.section_defines[0]
+
+    def set_section(self, value):
+        self.current_section_define = self.section_defines[value]
+
+    def __getitem__(self, key):
+        return self.current_section_define[key]
+
+    def __setitem__(self, key, value):
+        self.current_section_define[key] = value
+
+
+class FlatDefines(Defines):
+
+    def set_section(self, value):
+        self.current_section = value
+
+
+def fill(defines, num_names):
+    names = []
+    for section in range(NUM_OF_UNITS + 1):
+        defines.set_section(section)
+        for index in range(num_names):
+            name = 'label_{}_{}'.format(section, index)
+            defines[name] = index
+            names.append(name)
+    return names
+
+
+def time_lookups(defines, names, repeat):
+    visible = [name for name in names if name.startswith('label_0_')]
+    begin = time.perf_counter()
+    for section in range(1, NUM_OF_UNITS + 1):
+        defines.set_section(section)
+        own = [name for name in names
+               if name.startswith('label_{}_'.format(section))]
+        lookups = visible + own
+        for _ in range(repeat):
+            for name in lookups:
+                defines[name]
+    return time.perf_counter() - begin, NUM_OF_UNITS * repeat * len(lookups)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--names', type=int, default=1000,
+                        help='Number of labels in each section.')
+    parser.add_argument('--repeat', type=int, default=20,
+                        help='Number of times to look up every label.')
+    args = parser.parse_args(argv)
+
+    for defines in [ChainMapDefines(), FlatDefines()]:
+        names = fill(defines, args.names)
+        elapsed, count = time_lookups(defines, names, args.repeat)
+        print('{:16} {:8.3f}s {:8.1f} ns/lookup'.format(
+            type(defines).__name__, elapsed, elapsed / count * 1e9))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""Compare LALR(1) and SLR(1) action table generation.
+
+Both generators share the LR(0) state graph, so the state counts are the
+same. The difference is in build time and the number of reduce entries
+in the table.
+
+    python3 -m benchmarks.bench_lalr1 [--sizes N ...]
+"""
+
+
+import argparse
+import time
+
+import lalr1
+import slr1
+from benchmarks.synthetic_grammar import make_chain_grammar
+
+
+def time_generator(generate, grammar):
+    begin = time.perf_counter()
+    table = generate(*grammar)
+    return len(table), time.perf_counter() - begin
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[200, 1000, 2000],
+                        help='Number of nonterminals in each grammar.')
+    args = parser.parse_args(argv)
+
+    from grammar import VNSRules, VNSSymbols
+    grammars = [('vns', (VNSSymbols, VNSSymbols.START, VNSRules))]
+    grammars.extend(('chain {}'.format(size), make_chain_grammar(size))
+                    for size in args.sizes)
+
+    print('{:>12} {:>13} {:>10} {:>13} {:>10}'.format(
+        'grammar', 'slr1 entries', 'slr1 (s)', 'lalr1 entries', 'lalr1 (s)'))
+    for name, grammar in grammars:
+        slr1_size, slr1_time = time_generator(
+            slr1.generate_action_table, grammar)
+        lalr1_size, lalr1_time = time_generator(
+            lalr1.generate_action_table, grammar)
+        print('{:>12} {:>13} {:>10.3f} {:>13} {:>10.3f}'.format(
+            name, slr1_size, slr1_time, lalr1_size, lalr1_time))
+
+
+if __name__ == '__main__':
+    main()
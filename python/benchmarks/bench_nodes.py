@@ -0,0 +1,69 @@
+"""Measure the memory held by parse trees.
+
+Parses a generated source file, keeping every instruction's tree, and
+reports the bytes allocated per instruction with tracemalloc.
+
+    python3 -m benchmarks.bench_nodes [--lines N]
+"""
+
+
+import argparse
+import random
+import time
+import tracemalloc
+
+import grammar
+
+
+SAMPLE_LINES = [
+    'ADD r1, r2, r3, 4',
+    'JIZ r3, loop',
+    'CAP',
+    'LDR r4, r5, r6',
+    'WCS r7',
+    'PSH r1, r30, r0, 1000',
+    ]
+
+
+def make_source(num_lines, seed=0):
+    chooser = random.Random(seed)
+    return '\n'.join(chooser.choice(SAMPLE_LINES)
+                     for _ in range(num_lines)).encode('ascii')
+
+
+def count_nodes(node):
+    count = 0
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        count += 1
+        stack.extend(getattr(node, 'children', ()))
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--lines', type=int, default=100000,
+                        help='Number of instructions to parse.')
+    args = parser.parse_args(argv)
+
+    text = make_source(args.lines)
+    tracemalloc.start()
+    begin = time.perf_counter()
+    before, _ = tracemalloc.get_traced_memory()
+    trees = list(grammar.iter_parse_buffer(text))
+    after, _ = tracemalloc.get_traced_memory()
+    elapsed = time.perf_counter() - begin
+    tracemalloc.stop()
+
+    nodes = sum(map(count_nodes, trees))
+    print('instructions:            {}'.format(len(trees)))
+    print('nodes per instruction:   {:.1f}'.format(nodes / len(trees)))
+    print('bytes per instruction:   {:.1f}'.format(
+        (after - before) / len(trees)))
+    print('bytes per node:          {:.1f}'.format((after - before) / nodes))
+    print('parse time (traced, s):  {:.3f}'.format(elapsed))
+
+
+if __name__ == '__main__':
+    main()
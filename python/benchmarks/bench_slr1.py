@@ -0,0 +1,40 @@
+"""Time SLR(1) state graph and action table generation.
+
+    python3 -m benchmarks.bench_slr1 [--sizes N ...]
+"""
+
+
+import argparse
+import time
+
+import slr1
+from benchmarks.synthetic_grammar import make_chain_grammar
+
+
+def time_generation(size):
+    symbols, start, rules = make_chain_grammar(size)
+    begin = time.perf_counter()
+    symbol_data = slr1.make_symbol_data(symbols, start, rules)
+    graph = slr1.make_state_graph(symbols, start, rules, symbol_data)
+    graph_time = time.perf_counter() - begin
+    table = slr1.make_action_table(graph, symbols, symbol_data)
+    total_time = time.perf_counter() - begin
+    num_states = sum(1 for _ in graph.iter_state_ids())
+    return num_states, len(table), graph_time, total_time
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[50, 100, 200, 400],
+                        help='Number of nonterminals in each grammar.')
+    args = parser.parse_args(argv)
+    print('{:>8} {:>8} {:>8} {:>10} {:>10}'.format(
+        'size', 'states', 'entries', 'graph (s)', 'total (s)'))
+    for size in args.sizes:
+        print('{:>8} {:>8} {:>8} {:>10.3f} {:>10.3f}'.format(
+            size, *time_generation(size)))
+
+
+if __name__ == '__main__':
+    main()
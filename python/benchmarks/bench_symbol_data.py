@@ -0,0 +1,65 @@
+"""Compare the nullable/FIRST/FOLLOW computations.
+
+The worklist version used by slr1.make_symbol_data is timed against the
+old approach of sweeping over every rule until nothing changes.
+
+    python3 -m benchmarks.bench_symbol_data [--sizes N ...]
+"""
+
+
+import argparse
+import time
+
+import slr1
+from cfg import get_eof_symbol
+from benchmarks.synthetic_grammar import make_chain_grammar
+
+
+def make_symbol_data_sweep(symbols, starting_symbol, rules):
+    symbol_data = slr1.SymbolData()
+    slr1.fill_terminals_first_set(symbols, symbol_data)
+    symbol_data[starting_symbol].follow_set.add(get_eof_symbol(symbols))
+    slr1.over_rules_until_false(
+        slr1.update_rule_nullable, rules, symbol_data)
+    slr1.over_rules_until_false(
+        slr1.update_rule_first_set, rules, symbol_data)
+    slr1.over_rules_until_false(
+        slr1.update_rule_follow_set, rules, symbol_data)
+    return symbol_data
+
+
+def same_symbol_data(left, right):
+    for symbol in set(left) | set(right):
+        if (left[symbol].nullable != right[symbol].nullable
+                or left[symbol].first_set != right[symbol].first_set
+                or left[symbol].follow_set != right[symbol].follow_set):
+            return False
+    return True
+
+
+def time_call(function, *args):
+    begin = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - begin
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[100, 200, 400, 800],
+                        help='Number of nonterminals in each grammar.')
+    args = parser.parse_args(argv)
+    print('{:>8} {:>8} {:>12} {:>12}'.format(
+        'size', 'rules', 'sweep (s)', 'worklist (s)'))
+    for size in args.sizes:
+        grammar = make_chain_grammar(size)
+        sweep, sweep_time = time_call(make_symbol_data_sweep, *grammar)
+        worklist, worklist_time = time_call(slr1.make_symbol_data, *grammar)
+        if not same_symbol_data(sweep, worklist):
+            raise AssertionError('Symbol data differs at size', size)
+        print('{:>8} {:>8} {:>12.3f} {:>12.3f}'.format(
+            size, len(grammar[2]), sweep_time, worklist_time))
+
+
+if __name__ == '__main__':
+    main()
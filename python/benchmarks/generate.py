@@ -0,0 +1,141 @@
+"""Generate synthetic VNS programs to benchmark with.
+
+A generated program has code in all 11 unit sections, each using the
+ABCS, AI and A format operations allowed in it. Lines get labels, jumps
+to those labels, comments and blank lines at a fixed rate, and every
+section includes a shared header file. The same size and seed always
+give the same program.
+
+    python3 -m benchmarks.generate --lines N --output DIR [--seed S]
+"""
+
+
+import argparse
+from pathlib import Path
+import random
+
+from defines import NUM_OF_UNITS
+from op_code import iter_section_operations
+
+
+HEADER_NAME = 'header.vns'
+HEADER_TEXT = '''\
+; Shared code, included at the start of every unit section.
+CAP                     ; wait for orders
+WCS r1
+TCS r2, 100
+ADD r3, r1, r2, 0       ; r3 = r1 + r2
+'''
+HEADER_LINES = HEADER_TEXT.count('\n')
+
+
+FORMATS = ('ABCS', 'AI', 'A')
+# One line in LABEL_EVERY is given a label.
+LABEL_EVERY = 16
+COMMENTS = [
+    'keep going',
+    'check the counter',
+    'TODO: tune this',
+    'loop back',
+    ]
+
+
+def _operations(section):
+    operations = list(iter_section_operations(section))
+    by_format = {format: sorted(data.name for data in operations
+                                if data.format == format)
+                 for format in FORMATS}
+    jumps = [name for name in by_format['AI'] if name[0] in 'JB']
+    return by_format, jumps
+
+
+def _register(chooser):
+    return 'r{}'.format(chooser.randrange(32))
+
+
+def _instruction(chooser, by_format, jumps, num_labels, label_prefix):
+    format = chooser.choice(FORMATS)
+    if format == 'AI' and num_labels and chooser.random() < 0.5:
+        return '{} {}, {}{}'.format(
+            chooser.choice(jumps), _register(chooser), label_prefix,
+            chooser.randrange(num_labels))
+    operation = chooser.choice(by_format[format])
+    if format == 'A':
+        return '{} {}'.format(operation, _register(chooser))
+    if format == 'AI':
+        return '{} {}, {}'.format(operation, _register(chooser),
+                                  chooser.randrange(1 << 20))
+    return '{} {}, {}, {}, {}'.format(
+        operation, _register(chooser), _register(chooser),
+        _register(chooser), chooser.randrange(512))
+
+
+def iter_section_lines(section, num_lines, chooser):
+    """Produce the lines of one unit section."""
+    by_format, jumps = _operations(section)
+    label_prefix = 's{}_'.format(section)
+    body_lines = max(num_lines - 2, 0)
+    num_labels = (body_lines + LABEL_EVERY - 1) // LABEL_EVERY
+    yield '.section {}'.format(section)
+    yield '.include {}'.format(HEADER_NAME)
+    for index in range(body_lines):
+        roll = chooser.random()
+        if index % LABEL_EVERY == 0:
+            line = '{}{}: '.format(label_prefix, index // LABEL_EVERY)
+            if roll < 0.25:
+                yield line.rstrip()
+                continue
+        else:
+            line = ''
+        if roll < 0.05:
+            yield line.rstrip()
+        elif roll < 0.15:
+            yield line + '; ' + chooser.choice(COMMENTS)
+        else:
+            line += _instruction(chooser, by_format, jumps, num_labels,
+                                 label_prefix)
+            if roll < 0.3:
+                line += '    ; ' + chooser.choice(COMMENTS)
+            yield line
+
+
+def iter_program_lines(num_lines, seed=0):
+    """Produce the lines of a program about num_lines long, not counting
+    the lines of the included header."""
+    chooser = random.Random(seed)
+    yield '; Generated program, {} lines, seed {}.'.format(num_lines, seed)
+    per_section, extra = divmod(max(num_lines - 1, 0), NUM_OF_UNITS)
+    for section in range(1, NUM_OF_UNITS + 1):
+        size = per_section + (1 if section <= extra else 0)
+        yield from iter_section_lines(section, size, chooser)
+
+
+def write_program(directory, num_lines, seed=0):
+    """Write a program and its header into directory.
+
+    return: The path of the program's main file.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    Path(directory, HEADER_NAME).write_text(HEADER_TEXT)
+    path = Path(directory, 'program_{}.vns'.format(num_lines))
+    with path.open('w') as file:
+        for line in iter_program_lines(num_lines, seed):
+            file.write(line + '\n')
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--lines', type=int, default=1000,
+                        help='Number of lines in the program.')
+    parser.add_argument('--output', default='.',
+                        help='Directory to write the program to.')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Seed of the random choices.')
+    args = parser.parse_args(argv)
+    print(write_program(args.output, args.lines, args.seed))
+
+
+if __name__ == '__main__':
+    main()
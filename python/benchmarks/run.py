@@ -0,0 +1,164 @@
+"""Measure assembler throughput on generated programs.
+
+For each program size, generates a program (see benchmarks.generate)
+and times lexing, parsing and a full run of recruiter.main on it, along
+with generating the grammar's action table once. Every measurement runs
+in a fresh process, so its peak RSS is its own. The report is JSON, with
+one entry per measurement:
+
+    {"benchmark": "parse", "lines": 10000, "seconds": ...,
+     "lines_per_second": ..., "peak_rss_kib": ...}
+
+    python3 -m benchmarks.run [--sizes N ...] [--output FILE]
+"""
+
+
+import argparse
+import json
+import multiprocessing
+from pathlib import Path
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+
+BENCHMARKS = ['lex', 'parse', 'recruiter']
+DEFAULT_SIZES = [1000, 10000, 100000, 1000000]
+
+
+def _section_code(path):
+    from assembler import prescan
+    from lines import SourceBuffer
+    with SourceBuffer(path) as buffer:
+        return [b'\n'.join(section.lines) for section in prescan(buffer)]
+
+
+def _consume(iterator):
+    count = 0
+    for _ in iterator:
+        count += 1
+    return count
+
+
+def bench_lex(path):
+    import grammar
+    codes = _section_code(path)
+    begin = time.perf_counter()
+    for code in codes:
+        _consume(grammar.iter_terminals_from_buffer(code))
+    return time.perf_counter() - begin
+
+
+def bench_parse(path):
+    import grammar
+    codes = _section_code(path)
+    begin = time.perf_counter()
+    for code in codes:
+        _consume(grammar.iter_parse_buffer(code))
+    return time.perf_counter() - begin
+
+
+def bench_recruiter(path):
+    import recruiter
+    begin = time.perf_counter()
+    recruiter.main([str(path), str(path.with_suffix('.bin'))])
+    return time.perf_counter() - begin
+
+
+def bench_table(path):
+    import grammar
+    begin = time.perf_counter()
+    grammar.load_compiled_table(cache_dir=path.parent, regenerate=True)
+    return time.perf_counter() - begin
+
+
+def _measure(name, path):
+    seconds = globals()['bench_' + name](path)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return seconds, peak
+
+
+def measure(name, path):
+    """Run a benchmark in a new process.
+
+    return: (seconds, peak RSS in KiB)
+    """
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(1) as pool:
+        return pool.apply(_measure, (name, path))
+
+
+def count_lines(path):
+    with path.open('rb') as file:
+        return sum(1 for _ in file)
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'describe', '--always', '--dirty'], check=True,
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            cwd=str(Path(__file__).parent)).stdout.decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(sizes, directory):
+    results = []
+    seconds, peak = measure('table', Path(directory, 'table'))
+    results.append({'benchmark': 'table', 'lines': None, 'seconds': seconds,
+                    'lines_per_second': None, 'peak_rss_kib': peak})
+    from benchmarks.generate import write_program
+    for size in sizes:
+        path = write_program(directory, size)
+        lines = count_lines(path)
+        for name in BENCHMARKS:
+            seconds, peak = measure(name, path)
+            rate = lines / seconds if seconds else None
+            results.append({
+                'benchmark': name,
+                'lines': lines,
+                'seconds': seconds,
+                'lines_per_second': rate,
+                'peak_rss_kib': peak,
+                })
+            print('{:10} {:8d} lines {:9.3f}s {:>10} lines/s {:8d} KiB'
+                  .format(name, lines, seconds,
+                          '-' if rate is None else '{:.0f}'.format(rate),
+                          peak),
+                  file=sys.stderr)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=DEFAULT_SIZES,
+                        help='Number of lines in each generated program.')
+    parser.add_argument('--output',
+                        help='File to write the JSON report to, instead of'
+                             ' stdout.')
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        results = run(args.sizes, directory)
+    report = {
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+        }
+    if args.output is None:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    else:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+            file.write('\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+"""Generators for large synthetic grammars.
+
+The VNS grammar is still tiny, these stand in for what it will grow
+into so table generation can be timed at scale.
+"""
+
+
+from cfg import (
+    Rule,
+    SymbolEnum,
+    )
+
+
+def make_chain_grammar(size):
+    """Create a grammar whose state graph grows linearly with size.
+
+    Each of the size nonterminals N<i> has two rules:
+        N<i> -> a<i> N<i+1> b<i>
+        N<i> -> b<i> c
+    and the last one ends the chain with N<size> -> c. That gives about
+    five states per nonterminal.
+
+    return: (symbols, starting_symbol, rules)
+    """
+    members = [('START', ('START', False))]
+    members.extend(('N{}'.format(i), ('N{}'.format(i), False))
+                   for i in range(size + 1))
+    for i in range(size):
+        members.append(('a{}'.format(i), ('a{}'.format(i), True)))
+        members.append(('b{}'.format(i), ('b{}'.format(i), True)))
+    members.append(('c', ('c', True)))
+    members.append(('_EOF', ('_EOF', None)))
+    symbols = SymbolEnum('ChainSymbols', members)
+
+    def sym(name, *args):
+        return symbols[name.format(*args)]
+
+    rules = [Rule(symbols.START, (sym('N0'),))]
+    for i in range(size):
+        rules.append(Rule(sym('N{}', i),
+                          (sym('a{}', i), sym('N{}', i + 1), sym('b{}', i))))
+        rules.append(Rule(sym('N{}', i), (sym('b{}', i), symbols.c)))
+    rules.append(Rule(sym('N{}', size), (symbols.c,)))
+    return symbols, symbols.START, rules
@@ -4,10 +4,13 @@
 __all__ = [
     'Action',
     'ActionTable',
+    'CompiledActionTable',
     'get_eof_symbol',
+    'iter_parse_compiled',
     'Node',
     'NonterminalNode',
     'parse',
+    'parse_compiled',
     'Rule',
     'RuleListing',
     'SymbolEnum',
@@ -15,6 +18,7 @@ __all__ = [
     ]
 
 
+from array import array
 from collections import namedtuple
 from collections.abc import Mapping
 import enum
@@ -106,6 +110,8 @@ class RuleListing(Rule, enum.Enum, metaclass=_RuleListingMeta):
 
 class Node:
 
+    __slots__ = ('symbol',)
+
     def __init__(self, symbol):
         self.symbol = symbol
 
@@ -116,8 +122,12 @@ class Node:
 
 class TerminalNode(Node):
 
+    __slots__ = ('text',)
+
     def __init__(self, symbol, text):
-        super().__init__(symbol)
+        # Set directly rather than through Node.__init__, these are made
+        # for every token.
+        self.symbol = symbol
         self.text = text
 
     def __eq__(self, other):
@@ -132,8 +142,10 @@ class TerminalNode(Node):
 
 class NonterminalNode(Node):
 
+    __slots__ = ('children', 'rule')
+
     def __init__(self, symbol, children, rule=None):
-        super().__init__(symbol)
+        self.symbol = symbol
         self.children = children
         if rule is None:
             rule = Rule(symbol, tuple(child.symbol for child in children))
@@ -162,26 +174,25 @@ def parse(symbol_enum, action_table, base_iterable):
     stream = NodeStream(base_iterable, eof_symbol)
 
     for token in stream.in_place():
-        action = action_table[current_state, token]
+        action = action_table[current_state, token.symbol]
         if 'shift' == action.kind:
             stack.push(current_state, next(stream))
             current_state = action.data
         elif 'reduce' == action.kind:
-            stream.push_back(token)
-            current_state, new_node = preform_reduce(stack, action.data)
+            current_state, new_node = preform_reduce(
+                stack, action.data, current_state)
             stream.push_back(new_node)
         elif 'done' == action.kind:
             break
     else:
         raise Exception('Ran out of input symbols.')
+    _, final_node = stack.pop()
     if stack:
         raise AssertionError('Extra symbols on the stack.')
-    final_node = next(stream)
-    assert next(stream).symbol == eof_symbol
     return final_node
 
 
-def preform_reduce(stack, rule):
+def preform_reduce(stack, rule, current_state):
     popped = []
     for target_symbol in reversed(rule.children):
         if stack.peek_node().symbol == target_symbol:
@@ -190,12 +201,153 @@ def preform_reduce(stack, rule):
             # TODO: Better error messages and recovery.
             # This should only ever be an internal error though.
             raise AssertionError()
-    state = popped[-1][0]
+    state = popped[-1][0] if popped else current_state
     node = NonterminalNode(
         rule.head, map(lambda x: x[1], reversed(popped)), rule)
     return (state, node)
 
 
+# Action kinds as stored in the low bits of a CompiledActionTable entry.
+ERROR = 0
+SHIFT = 1
+REDUCE = 2
+DONE = 3
+_KIND_BITS = 2
+_KIND_MASK = (1 << _KIND_BITS) - 1
+
+
+def parse_compiled(compiled_table, base_iterable):
+    """Parse in input using a CompiledActionTable.
+
+    This does the same job as parse, but runs entirely on the integer
+    arrays of compiled_table. There is no Action object or string
+    comparison per token and no push-back stream, reductions pop the
+    state and node stacks directly.
+
+    compiled_table: CompiledActionTable stating what action to take at
+        any given point.
+    base_iterable: Produces (symbol, text) pairs for every token in
+        the input file.
+
+    return: A Node is the root of all other nodes in input.
+    """
+    for node in iter_parse_compiled(
+            compiled_table, base_iterable, compiled_table.eof_symbol):
+        return node
+    raise Exception('Ran out of input symbols.')
+
+
+def iter_parse_compiled(compiled_table, base_iterable, separator):
+    """Parse a stream of inputs divided by a separator symbol.
+
+    Each separator (and the end of base_iterable) ends the current input
+    as if it were the End-Of-File symbol, then the parser is reset for
+    the next one. Empty inputs between separators are skipped.
+
+    compiled_table: CompiledActionTable stating what action to take at
+        any given point.
+    base_iterable: Produces (symbol, text) pairs for every token in
+        the input file.
+    separator: Symbol that ends each input. It never appears in the
+        parse trees.
+
+    return: Iterator producing the root Node of each input.
+    """
+    actions = compiled_table.actions
+    width = compiled_table.width
+    symbol_index = compiled_table.symbol_index
+    rules = compiled_table.rules
+    head_index = compiled_table.head_index
+    eof_column = symbol_index[compiled_table.eof_symbol]
+
+    states = [compiled_table.starting_state]
+    nodes = []
+    tokens = itertools.chain(base_iterable, [(separator, None)])
+    for symbol, text in tokens:
+        if symbol is separator:
+            if not nodes:
+                continue
+            column = eof_column
+        else:
+            column = symbol_index[symbol]
+        while True:
+            code = actions[states[-1] * width + column]
+            kind = code & _KIND_MASK
+            if SHIFT == kind:
+                states.append(code >> _KIND_BITS)
+                nodes.append(TerminalNode(symbol, text))
+                break
+            elif REDUCE == kind:
+                rule_id = code >> _KIND_BITS
+                rule = rules[rule_id]
+                length = len(rule.children)
+                if length:
+                    children = tuple(nodes[-length:])
+                    del nodes[-length:]
+                    del states[-length:]
+                else:
+                    children = ()
+                nodes.append(NonterminalNode(rule.head, children, rule))
+                goto = actions[states[-1] * width + head_index[rule_id]]
+                states.append(goto >> _KIND_BITS)
+            elif DONE == kind:
+                if len(nodes) != 1:
+                    raise AssertionError('Extra symbols on the stack.')
+                yield nodes.pop()
+                del states[1:]
+                break
+            else:
+                raise KeyError(states[-1], symbol)
+
+
+class CompiledActionTable:
+    """An ActionTable frozen into a dense array of integers.
+
+    Every state has a row with one column per symbol of the SymbolEnum.
+    Entries are the action kind (ERROR, SHIFT, REDUCE or DONE) in the low
+    bits with the target state or rule number above them.
+
+    action_table: The ActionTable to compile, it is not modified.
+    symbol_enum: The SymbolEnum subclass the table's symbols are drawn
+        from, which gives the column order.
+    """
+
+    def __init__(self, action_table, symbol_enum):
+        self.symbols = tuple(symbol_enum)
+        self.symbol_index = {
+            symbol: index for index, symbol in enumerate(self.symbols)}
+        self.eof_symbol = get_eof_symbol(symbol_enum)
+        self.starting_state = action_table.starting_state
+        self.width = len(self.symbols)
+        self.rules = []
+        self.head_index = []
+        rule_ids = {}
+
+        entries = list(action_table.items())
+        num_states = 1 + max(
+            (state for (state, _), _ in entries), default=0)
+        self.actions = array('l', [ERROR]) * (num_states * self.width)
+        for (state, symbol), action in entries:
+            if 'shift' == action.kind:
+                code = action.data << _KIND_BITS | SHIFT
+            elif 'reduce' == action.kind:
+                rule = action.data
+                if rule not in rule_ids:
+                    rule_ids[rule] = len(self.rules)
+                    self.rules.append(rule)
+                    self.head_index.append(self.symbol_index[rule.head])
+                code = rule_ids[rule] << _KIND_BITS | REDUCE
+            elif 'done' == action.kind:
+                code = DONE
+            else:
+                raise ValueError('Unknown action kind.', action.kind)
+            self.actions[state * self.width + self.symbol_index[symbol]] = code
+
+    @property
+    def num_states(self):
+        return len(self.actions) // self.width
+
+
 class ActionTable(Mapping):
     """An action table stores shift/reduce rules."""
 
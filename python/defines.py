@@ -12,20 +12,27 @@ with as will not happen here.
 """
 
 
-from collections import ChainMap
+from sys import intern
 
 
 NUM_OF_UNITS = 11
 
 
 class Defines:
-    """All defines currently 'active' in the program."""
+    """All defines currently 'active' in the program.
+
+    Each section has a flat dict holding its own defines and every
+    shared define it does not override, so a look up is a single probe.
+    Writing to section 0 updates the sections that see the define.
+    Names are interned, so every section's dict shares one string for
+    each name.
+    """
 
     def __init__(self):
         self._current_section = 0
-        self.section_defines = [ChainMap({})]
-        self.section_defines.extend(
-            self.section_defines[0].new_child() for _ in range(NUM_OF_UNITS))
+        self.section_defines = [{} for _ in range(NUM_OF_UNITS + 1)]
+        # The names each unit section defines itself.
+        self._own_names = [set() for _ in range(NUM_OF_UNITS + 1)]
         self.current_section_define = self.section_defines[0]
 
     @property
@@ -39,11 +46,40 @@ class Defines:
         self._current_section = value
         self.current_section_define = self.section_defines[value]
 
+    def _unit_sections_sharing(self, key):
+        """Get the defines of each unit section that sees shared key."""
+        return [defines for defines, own_names in zip(
+                    self.section_defines[1:], self._own_names[1:])
+                if key not in own_names]
+
     def __getitem__(self, key):
         return self.current_section_define[key]
 
+    def __contains__(self, key):
+        return key in self.current_section_define
+
+    def get(self, key, default=None):
+        return self.current_section_define.get(key, default)
+
     def __setitem__(self, key, value):
+        key = intern(key)
         self.current_section_define[key] = value
+        if self._current_section:
+            self._own_names[self._current_section].add(key)
+        else:
+            for defines in self._unit_sections_sharing(key):
+                defines[key] = value
 
     def __delitem__(self, key):
-        del self.current_section_define[key]
+        section = self._current_section
+        if section:
+            self._own_names[section].remove(key)
+            shared = self.section_defines[0]
+            if key in shared:
+                self.current_section_define[key] = shared[key]
+            else:
+                del self.current_section_define[key]
+        else:
+            del self.current_section_define[key]
+            for defines in self._unit_sections_sharing(key):
+                del defines[key]
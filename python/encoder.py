@@ -0,0 +1,108 @@
+"""Encode instructions as machine words.
+
+Every instruction is one 32-bit word. The op code takes the top 7 bits
+and the arguments are packed below it, in the order the instruction's
+format lists them:
+
+    ABCS: OOOOOOO AAAAA BBBBB CCCCC SSSSSSSSSS
+    AI:   OOOOOOO AAAAA IIIIIIIIIIIIIIIIIIII
+    L:    LLLLLLLLLLLLLLLLLLLLLLLLLLLLLLLL (RAW, the word is the value)
+
+Arguments left off the end of an instruction are 0 (or r0). An
+identifier given for an immediate is left 0 and recorded as a fixup, to
+be filled in once its value is known (see labels.py).
+
+A SectionEncoder packs each instruction into its word as it is added,
+and keeps the words of a section in one array. Words are written
+little-endian.
+"""
+
+
+__all__ = [
+    'encode_field',
+    'EncodingError',
+    'SectionEncoder',
+    ]
+
+
+from array import array
+import sys
+
+from op_code import FIELD_DESCRIPTORS
+from syntax import (
+    IdentifierNode,
+    IntegerNode,
+    RegisterNode,
+    )
+
+
+# The array type code of a 32-bit unsigned integer.
+WORD_TYPE = next(code for code in 'ILH' if array(code).itemsize == 4)
+_OP_CODE_SHIFT = FIELD_DESCRIPTORS['O'].shift
+
+
+class EncodingError(Exception):
+    """An argument can not be encoded in its field."""
+
+
+def encode_field(field, value):
+    """Check that value fits in field and mask it to the field's width.
+
+    field: An op_code.FieldDescriptor.
+    """
+    if not field.low <= value <= field.high:
+        raise EncodingError('Value out of range', value, field.letter)
+    return value & field.mask
+
+
+class SectionEncoder:
+    """Packs the instructions of a section into words.
+
+    fixups: (word index, field, name) of each identifier argument.
+    """
+
+    def __init__(self):
+        self._words = array(WORD_TYPE)
+        self.fixups = []
+
+    def __len__(self):
+        return len(self._words)
+
+    def add(self, op_data, args):
+        """Add an instruction.
+
+        op_data: The op_code.OpData of the instruction's operation.
+        args: The instruction's argument syntax nodes.
+        """
+        descriptor = op_data.descriptor
+        if descriptor.arity < len(args):
+            raise EncodingError('Too many arguments', len(args))
+        word = (op_data.op_code or 0) << _OP_CODE_SHIFT
+        for field, arg in zip(descriptor.fields, args):
+            if field.register:
+                if not isinstance(arg, RegisterNode):
+                    raise EncodingError('Expected a register', str(arg))
+                word |= arg.number << field.shift
+            elif isinstance(arg, IntegerNode):
+                word |= encode_field(field, int(arg)) << field.shift
+            elif isinstance(arg, IdentifierNode):
+                self.fixups.append((len(self), field.letter, str(arg)))
+            else:
+                raise EncodingError('Expected an integer', str(arg))
+        self._words.append(word)
+
+    def words(self):
+        """Get the instructions as an array of 32-bit words."""
+        return array(WORD_TYPE, self._words)
+
+    def to_bytes(self):
+        """Get the section's machine code, little-endian."""
+        if sys.byteorder == 'little':
+            return self._words.tobytes()
+        words = self.words()
+        words.byteswap()
+        return words.tobytes()
+
+    def write(self, file):
+        """Write the section's machine code to a binary file."""
+        file.write(self.to_bytes())
@@ -2,21 +2,29 @@
 
 
 __all__ = [
+    'iter_parse_buffer',
+    'iter_terminals_from_buffer',
     'iter_terminals_from_str',
+    'parse_buffer',
+    'parse_string',
     ]
 
 
 import enum
+from itertools import chain
 import re
+from sys import intern
 
 import cfg
-from op_code import OPERATIONS
+from op_code import OPERATION_INDEX
 from slr1 import generate_action_table
+import table_cache
 
 
 @enum.unique
 class VNSSymbols(cfg.SymbolEnum):
     START = ('START', False)
+    LABEL = ('LABEL', False)
     INSTRUCTION = ('INSTRUCTION', False)
     OPERATION = ('OPERATION', False)
     ARGS = ('ARGS', False)
@@ -28,48 +36,166 @@ class VNSSymbols(cfg.SymbolEnum):
     Integer = ('Integer', True)
     Identifier = ('Identifier', True)
     Comma = ('Comma', True)
+    Colon = ('Colon', True)
+    Newline = ('Newline', True)
 
     _EOF = ('_EOF', None)
 
 
 def iter_terminals_from_str(string):
-    for part in string.split():
-        while part:
-            symbol, text, part = remove_terminal_from_str(part)
-            yield symbol, text
-
-
-def remove_terminal_from_str(string):
-    for symbol, pattern in TERMINAL_PATTERNS:
-        match = pattern.match(string)
-        if match:
-            return symbol, match.group(), string[match.end():]
-    raise Exception('Could not match', string)
-
-
+    """Iterate over the (symbol, text) pairs for every terminal in string.
+
+    The whole string is scanned in one pass with TERMINAL_REGEX, matching
+    at increasing offsets, so no part of the string is copied other than
+    the text of each terminal.
+    """
+    return _iter_terminals(TERMINAL_REGEX, string)
+
+
+def iter_terminals_from_buffer(buffer, start=0, end=None):
+    """Iterate over the (symbol, text) pairs for every terminal in buffer.
+
+    buffer is a bytes-like object (such as an mmap) holding the text of
+    one or more lines. Comments are skipped and the end of each line is a
+    Newline. Only buffer[start:end] is scanned, and nothing but the text
+    of each terminal is copied out.
+    """
+    match_at = BYTES_TEXT_TERMINAL_REGEX.match
+    pos = start
+    if end is None:
+        end = len(buffer)
+    while pos < end:
+        match = match_at(buffer, pos, end)
+        if match is None:
+            raise Exception('Could not match',
+                            bytes(buffer[pos:end]).decode(errors='replace'))
+        kind = match.lastgroup
+        if kind is not None:
+            raw = match.group()
+            text = _SHARED_BYTES.get(raw)
+            if text is None:
+                text = raw.decode('ascii')
+            if kind == _IDENTIFIER and text in OPERATION_INDEX:
+                yield VNSSymbols.Operation, text
+            else:
+                yield _GROUP_SYMBOLS[kind], text
+        pos = match.end()
+
+
+def _iter_terminals(regex, string):
+    match_at = regex.match
+    pos = 0
+    end = len(string)
+    while pos < end:
+        match = match_at(string, pos)
+        if match is None:
+            raise Exception('Could not match', string[pos:])
+        kind = match.lastgroup
+        if kind is not None:
+            text = match.group()
+            text = _SHARED_TEXT.get(text, text)
+            if kind == _IDENTIFIER and text in OPERATION_INDEX:
+                yield VNSSymbols.Operation, text
+            else:
+                yield _GROUP_SYMBOLS[kind], text
+        pos = match.end()
+
+
+def compile_terminal_regex(terminal_patterns, skip_pattern='\\s+'):
+    """Combine the terminal patterns into a single regular expression.
+
+    Each pattern becomes a named group (the symbol's name) and they are
+    tried in the order given, so earlier terminals still take priority.
+    The skip pattern is an unnamed group, so matches of it have no
+    lastgroup.
+    """
+    alternatives = ['(?:{})'.format(skip_pattern)]
+    for symbol, pattern in terminal_patterns:
+        source = pattern.pattern
+        if pattern.flags & re.IGNORECASE:
+            source = '(?i:{})'.format(source)
+        alternatives.append('(?P<{}>{})'.format(symbol.name, source))
+    return re.compile('|'.join(alternatives))
+
+
+def compile_bytes_regex(regex):
+    """Get the bytes version of an ASCII only str regular expression."""
+    return re.compile(regex.pattern.encode('ascii'), regex.flags & ~re.UNICODE)
+
+
+# Operation names are matched as identifiers, the lexers then pick them
+# out with op_code.OPERATION_INDEX.
 TERMINAL_PATTERNS = [
     (VNSSymbols.Register, re.compile('\\br([12][0-9]|3[01]|[0-9])\\b')),
-    (VNSSymbols.Operation, re.compile('|'.join(OPERATIONS), re.IGNORECASE)),
     (VNSSymbols.Integer, re.compile('[0-9]+')),
     (VNSSymbols.Identifier, re.compile('[_a-zA-Z][_a-zA-Z0-9]*')),
     (VNSSymbols.Comma, re.compile(',')),
+    (VNSSymbols.Colon, re.compile(':')),
     ]
 
 
+TERMINAL_REGEX = compile_terminal_regex(TERMINAL_PATTERNS)
+TEXT_TERMINAL_REGEX = compile_terminal_regex(
+    TERMINAL_PATTERNS + [(VNSSymbols.Newline, re.compile('\n'))],
+    skip_pattern='[ \t\r\f\v]+|;[^\n]*')
+BYTES_TEXT_TERMINAL_REGEX = compile_bytes_regex(TEXT_TERMINAL_REGEX)
+
+
+# The text of the terminals that can only be spelt a fixed number of
+# ways: operation names, registers and punctuation. The lexers give one
+# shared string for each of them, so trees do not hold a copy per token.
+# Integers and identifiers are not shared, as there is no end to them and
+# a long running process would keep every one it ever saw.
+_SHARED_TEXT = {intern(text): intern(text) for text in chain(
+    OPERATION_INDEX, ('r{}'.format(number) for number in range(32)),
+    [',', ':', '\n'])}
+_SHARED_BYTES = {text.encode('ascii'): text for text in _SHARED_TEXT}
+_GROUP_SYMBOLS = {symbol.name: symbol for symbol in VNSSymbols}
+_IDENTIFIER = VNSSymbols.Identifier.name
+
+
 class VNSRules(cfg.RuleListing, symbol_type=VNSSymbols):
     LINE = 'START', ['OPERATION', 'ARGS']
+    LABELED_LINE = 'START', ['LABEL', 'OPERATION', 'ARGS']
+    LABEL_LINE = 'START', ['LABEL']
+    LABEL_NAME = 'LABEL', ['Identifier', 'Colon']
+    OPERATION_NAME = 'OPERATION', ['Operation']
     NO_ARG = 'ARGS', []
     ONE_ARG = 'ARGS', ['ARGUMENT']
     MULTI_ARG = 'ARGS', ['ARGUMENT', 'ARG_TAIL']
     MORE_ARGS = 'ARG_TAIL', ['Comma', 'ARGUMENT', 'ARG_TAIL']
+    LAST_ARG = 'ARG_TAIL', ['Comma', 'ARGUMENT']
     ARG_REGISTER = 'ARGUMENT', ['Register']
     ARG_IMEDIATE = 'ARGUMENT', ['Integer']
     ARG_IDENTIFIER = 'ARGUMENT', ['Identifier']
 
 
-_action_table = generate_action_table(VNSSymbols, VNSSymbols.START, VNSRules)
+def load_compiled_table(cache_dir=None, regenerate=False):
+    """Get the compiled VNS action table, using the table cache."""
+    return table_cache.load_compiled_table(
+        'vns', VNSSymbols, VNSSymbols.START, VNSRules,
+        generate_action_table, cache_dir=cache_dir, regenerate=regenerate)
+
+
+_compiled_table = load_compiled_table()
 
 
 def parse_string(string):
     iter = iter_terminals_from_str(string)
-    return cfg.parse(VNSSymbols, _action_table, iter)
+    return cfg.parse_compiled(_compiled_table, iter)
+
+
+def parse_buffer(buffer, start=0, end=None):
+    """Parse the single instruction in buffer[start:end]."""
+    iter = iter_terminals_from_buffer(buffer, start, end)
+    return cfg.parse_compiled(_compiled_table, iter)
+
+
+def iter_parse_buffer(buffer):
+    """Parse a bytes-like buffer, such as a mapped file, one line at a
+    time.
+
+    return: Iterator producing the parse tree of each non-blank line.
+    """
+    iter = iter_terminals_from_buffer(buffer)
+    return cfg.iter_parse_compiled(_compiled_table, iter, VNSSymbols.Newline)
@@ -0,0 +1,162 @@
+"""Keep track of included files.
+
+An IncludeManager finds the file an include names and pre-scans it into
+the code of each of its lines, remembering both. A file is scanned again
+only if its modification time or size changed, so a header included by
+every unit section is only read once. The manager also records which
+files include which, to find include cycles and to tell which sources
+need to be rebuilt when a file changes.
+"""
+
+
+__all__ = [
+    'IncludeError',
+    'IncludeManager',
+    'scan_buffer',
+    ]
+
+
+import os
+from pathlib import Path
+
+import instrument
+from lines import SourceBuffer
+
+
+class IncludeError(Exception):
+    """A file could not be included."""
+
+
+def scan_buffer(buffer):
+    """Get the (line number, code) of each line in a lines.SourceBuffer
+    that has code on it, with the comment and surrounding space removed.
+    """
+    data = buffer.data
+    entries = []
+    for span in buffer.iter_physical():
+        code = data[span.start:span.code_end()].strip()
+        if code:
+            entries.append((span.line_number, code))
+    return tuple(entries)
+
+
+def file_stamp(path):
+    """Get the (modification time, size) of a file."""
+    stat = os.stat(str(path))
+    return stat.st_mtime_ns, stat.st_size
+
+
+class IncludeManager:
+    """Caches included files and the graph of which file includes which.
+
+    graph: Mapping from each file that includes others to the files it
+        includes, in the order they were included.
+    """
+
+    def __init__(self):
+        self._paths = {}
+        self._scans = {}
+        self._stack = []
+        self.graph = {}
+        self.hits = 0
+        self.misses = 0
+
+    def resolve(self, name, including_path):
+        """Find the file that name refers to.
+
+        name is relative to the current working directory, or if there
+        is no such file, to the directory of the including file.
+        """
+        key = (name, including_path.parent)
+        path = self._paths.get(key)
+        if path is None:
+            for candidate in [Path(name), Path(including_path.parent, name)]:
+                if candidate.is_file():
+                    path = candidate.resolve()
+                    break
+            else:
+                raise IncludeError('Include file not found', name,
+                                   str(including_path))
+            self._paths[key] = path
+        return path
+
+    def scan(self, path):
+        """Get the lines of code in a file, see scan_buffer."""
+        stamp = file_stamp(path)
+        cached = self._scans.get(path)
+        if cached is not None and cached[0] == stamp:
+            self.hits += 1
+            return cached[1]
+        self.misses += 1
+        with instrument.phase('scan', path), SourceBuffer(path) as buffer:
+            entries = scan_buffer(buffer)
+        self._scans[path] = (stamp, entries)
+        return entries
+
+    def include(self, name, including_path):
+        """Start including a file, use as a context manager.
+
+        Records the include in the graph and raises IncludeError if the
+        file is already being included (an include cycle).
+
+        return: The path of the included file.
+        """
+        path = self.resolve(name, including_path)
+        return _Including(self, including_path, path)
+
+    def enter(self, path):
+        """Mark path as being read, as the start of an include chain."""
+        if path in self._stack:
+            cycle = self._stack[self._stack.index(path):] + [path]
+            raise IncludeError('Include cycle',
+                               ' -> '.join(str(step) for step in cycle))
+        self._stack.append(path)
+
+    def leave(self, path):
+        assert self._stack[-1] == path
+        self._stack.pop()
+
+    def dependencies(self, path):
+        """Get every file path includes, directly or indirectly."""
+        found = set()
+        stack = [path]
+        while stack:
+            for included in self.graph.get(stack.pop(), ()):
+                if included not in found:
+                    found.add(included)
+                    stack.append(included)
+        return found
+
+    def snapshot(self, path):
+        """Get the stamp of path and each file it depends on."""
+        return {file: file_stamp(file)
+                for file in self.dependencies(path) | {path}}
+
+    @staticmethod
+    def needs_rebuild(snapshot):
+        """Check if any file in a snapshot changed since it was taken."""
+        for file, stamp in snapshot.items():
+            try:
+                if file_stamp(file) != stamp:
+                    return True
+            except OSError:
+                return True
+        return False
+
+
+class _Including:
+
+    def __init__(self, manager, including_path, path):
+        self.manager = manager
+        self.including_path = including_path
+        self.path = path
+
+    def __enter__(self):
+        self.manager.enter(self.path)
+        included = self.manager.graph.setdefault(self.including_path, [])
+        if self.path not in included:
+            included.append(self.path)
+        return self.path
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.manager.leave(self.path)
@@ -0,0 +1,127 @@
+"""Reuse the assembled sections that did not change between runs.
+
+A SectionCache maps a hash of each section's code, as found by the
+pre-scan, to what assembling it gave: the listing, the machine code
+(before labels are resolved), the labels and the fixups. It is saved to
+a cache file after a run and loaded at the start of the next one, so
+after an edit only the sections whose code changed are parsed, checked
+and encoded again. Labels are always resolved again, as a label can move
+without the sections using it changing.
+"""
+
+
+__all__ = [
+    'default_cache_path',
+    'section_key',
+    'SectionCache',
+    ]
+
+
+import hashlib
+from pathlib import Path
+
+from assembler import SectionResult
+import grammar
+from table_cache import (
+    default_cache_dir,
+    grammar_key,
+    read_pickle,
+    source_digest,
+    write_pickle,
+    )
+
+
+# Increase whenever the cache file layout or SectionResult changes.
+CACHE_VERSION = 2
+
+
+# The modules that decide what a section assembles to.
+ASSEMBLER_MODULES = (
+    '_op_code',
+    'assembler',
+    'encoder',
+    'grammar',
+    'labels',
+    'op_code',
+    'syntax',
+    )
+
+
+def default_cache_path(source_path):
+    """Get the section cache file used for a source file."""
+    name = hashlib.sha256(str(source_path).encode('utf-8')).hexdigest()
+    return Path(default_cache_dir(), 'incremental', name[:32] + '.sections')
+
+
+_key = None
+
+
+def _cache_key():
+    global _key
+    if _key is None:
+        _key = (CACHE_VERSION,
+                grammar_key(grammar.VNSSymbols, grammar.VNSSymbols.START,
+                            grammar.VNSRules, grammar.generate_action_table),
+                source_digest(ASSEMBLER_MODULES))
+    return _key
+
+
+def section_key(section):
+    """Hash the id and code of an assembler.Section."""
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(section.id.to_bytes(1, 'little'))
+    for line in section.lines:
+        hasher.update(line)
+        hasher.update(b'\n')
+    return hasher.digest()
+
+
+class SectionCache:
+    """Assembled sections, keyed by a hash of their code.
+
+    path: The file the cache is saved to.
+    entries: Mapping from section_key to (listing, code, labels, fixups),
+        from an earlier run.
+    """
+
+    def __init__(self, path, entries=None):
+        self.path = path
+        self._old_entries = entries if entries is not None else {}
+        self._entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def load(cls, path):
+        """Load the cache saved at path, or start an empty one."""
+        data = read_pickle(path)
+        if not isinstance(data, dict) or data.get('key') != _cache_key():
+            return cls(path)
+        return cls(path, data['entries'])
+
+    def save(self):
+        """Save the entries used since the cache was loaded.
+
+        Sections that were not seen this run are dropped, so the cache
+        only holds the source file's current sections.
+        """
+        data = {'key': _cache_key(), 'entries': self._entries}
+        write_pickle(self.path, data)
+
+    def get(self, section):
+        """Get the assembler.SectionResult of a section that has not
+        changed, or None if it has to be assembled."""
+        key = section_key(section)
+        entry = self._old_entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries[key] = entry
+        return SectionResult(section.id, *entry)
+
+    def add(self, section, result):
+        """Remember the SectionResult of a section, as it is before its
+        labels are resolved."""
+        self._entries[section_key(section)] = (
+            result.listing, result.code, result.labels, result.fixups)
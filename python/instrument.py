@@ -0,0 +1,204 @@
+"""Record where the assembler spends its time.
+
+Code marks each phase of its work with `with phase(name):`. Nothing is
+recorded unless a Recorder has been started, in which case it counts the
+calls and wall time of each phase, per source file. If the Recorder was
+started with trace_memory, it also uses tracemalloc to record the bytes
+each phase allocated (and kept) and the peak it reached above where it
+started. Tracing memory slows everything down, the times are only
+comparable with other traced runs. If tracemalloc was already tracing,
+it is left running when the Recorder is stopped. Before Python 3.9 the
+peak can not be reset, so a phase that stays below an earlier peak only
+reports the memory it kept.
+
+The assembler's phases are prescan, scan (of included files), parse,
+syntax, encode, resolve and write. Syntax nodes build their arguments on
+first use, and only the encoder uses them, so the cost of building the
+arguments is counted in encode and syntax is nearly empty.
+
+The results can be reported as text or JSON.
+"""
+
+
+__all__ = [
+    'enabled',
+    'phase',
+    'Recorder',
+    'source_file',
+    'start',
+    'stop',
+    ]
+
+
+from contextlib import contextmanager
+import json
+import time
+import tracemalloc
+
+
+class _NullContext:
+    """A context manager that does nothing, for phases not recorded."""
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NULL_CONTEXT = _NullContext()
+
+
+# tracemalloc.reset_peak is new in Python 3.9.
+_CAN_RESET_PEAK = hasattr(tracemalloc, 'reset_peak')
+
+
+_recorder = None
+
+
+class PhaseStats:
+    """The totals recorded for one phase of one file."""
+
+    __slots__ = ('calls', 'seconds', 'allocated', 'peak')
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.allocated = 0
+        self.peak = 0
+
+    def to_dict(self, trace_memory=True):
+        names = self.__slots__ if trace_memory else self.__slots__[:2]
+        return {name: getattr(self, name) for name in names}
+
+
+class Recorder:
+    """Collects PhaseStats, keyed by (source file, phase name).
+
+    Phases started inside another phase are recorded as well, but the
+    outer phase's time and memory include theirs. The peak is only
+    measured for outermost phases.
+    """
+
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        # True if start turned tracemalloc on, so stop turns it off.
+        self.started_tracing = False
+        self.stats = {}
+        self.file = None
+        self._depth = 0
+
+    @contextmanager
+    def phase(self, name, file=None):
+        stats = self.stats.get((file or self.file, name))
+        if stats is None:
+            stats = self.stats[(file or self.file, name)] = PhaseStats()
+        outermost = self._depth == 0
+        self._depth += 1
+        if self.trace_memory:
+            if outermost and _CAN_RESET_PEAK:
+                tracemalloc.reset_peak()
+            before, start_peak = tracemalloc.get_traced_memory()
+        begin = time.perf_counter()
+        try:
+            yield stats
+        finally:
+            stats.seconds += time.perf_counter() - begin
+            stats.calls += 1
+            self._depth -= 1
+            if self.trace_memory:
+                after, peak = tracemalloc.get_traced_memory()
+                stats.allocated += after - before
+                if outermost:
+                    stats.peak = max(stats.peak,
+                                     _phase_peak(before, start_peak, after,
+                                                 peak))
+
+    def to_dict(self):
+        """Get the recorded stats as a JSON ready dict."""
+        files = {}
+        for (file, name), stats in self.stats.items():
+            phases = files.setdefault(str(file), {})
+            phases[name] = stats.to_dict(self.trace_memory)
+        return {'trace_memory': self.trace_memory, 'files': files}
+
+    def write_json(self, file):
+        json.dump(self.to_dict(), file, indent=2)
+        file.write('\n')
+
+    def write_text(self, file):
+        columns = '{:<12} {:>8} {:>10}'
+        header = columns.format('phase', 'calls', 'seconds')
+        if self.trace_memory:
+            columns += ' {:>12} {:>12}'
+            header = columns.format('phase', 'calls', 'seconds',
+                                    'allocated', 'peak')
+        for file_name, phases in self.to_dict()['files'].items():
+            file.write('{}\n  {}\n'.format(file_name, header))
+            for name, stats in phases.items():
+                values = [name, stats['calls'],
+                          '{:.4f}'.format(stats['seconds'])]
+                if self.trace_memory:
+                    values += [stats['allocated'], stats['peak']]
+                file.write('  {}\n'.format(columns.format(*values)))
+
+
+def _phase_peak(before, start_peak, after, peak):
+    """Get how far memory rose above before during a phase.
+
+    With reset_peak, peak is the phase's own. Without it, peak is only
+    the phase's if it went past the peak from before the phase started,
+    otherwise the memory kept at the end is all that is known.
+    """
+    if _CAN_RESET_PEAK or start_peak < peak:
+        return peak - before
+    return max(after - before, 0)
+
+
+def start(trace_memory=False):
+    """Start recording phases, return the new Recorder."""
+    global _recorder
+    _recorder = Recorder(trace_memory)
+    if trace_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _recorder.started_tracing = True
+    return _recorder
+
+
+def stop():
+    """Stop recording phases, return the Recorder that was used."""
+    global _recorder
+    recorder, _recorder = _recorder, None
+    if recorder is not None and recorder.started_tracing:
+        tracemalloc.stop()
+    return recorder
+
+
+def enabled():
+    """Check if phases are being recorded."""
+    return _recorder is not None
+
+
+def phase(name, file=None):
+    """Record a phase, use as a context manager.
+
+    file: The source file the phase is working on, by default the one
+        given to the surrounding source_file.
+    """
+    if _recorder is None:
+        return _NULL_CONTEXT
+    return _recorder.phase(name, file)
+
+
+@contextmanager
+def source_file(path):
+    """Attribute the phases inside to the source file path."""
+    recorder = _recorder
+    if recorder is None:
+        yield
+        return
+    previous, recorder.file = recorder.file, path
+    try:
+        yield
+    finally:
+        recorder.file = previous
@@ -0,0 +1,86 @@
+"""Resolve labels used as immediate values.
+
+Labels are resolved in two passes instead of going back over the source.
+While a section is assembled, the first pass records the address (word
+index in the section) of every label defined in it, and encodes each
+instruction that uses an identifier with a 0 in its place, adding a
+Fixup for it. Once every section is assembled the labels are collected
+into a defines.Defines, so each section sees its own labels and those of
+the shared section, and a single pass over the fixups patches the value
+of each one into its word.
+"""
+
+
+__all__ = [
+    'Fixup',
+    'resolve_fixups',
+    'ResolutionError',
+    ]
+
+
+from collections import namedtuple
+import struct
+
+from defines import Defines
+from encoder import (
+    encode_field,
+    EncodingError,
+    )
+from op_code import FIELD_DESCRIPTORS
+
+
+Fixup = namedtuple('Fixup', ['section', 'index', 'field', 'symbol'])
+Fixup.__doc__ = """An identifier used in an instruction.
+
+section: The id of the section the instruction is in.
+index: The instruction's word index in the section.
+field: The field letter (see op_code.FIELDS) the identifier is used in.
+symbol: The identifier.
+"""
+
+
+_WORD = struct.Struct('<I')
+
+
+class ResolutionError(Exception):
+    """A label could not be resolved."""
+
+
+def define_labels(results):
+    """Collect the labels of every section into a Defines."""
+    defines = Defines()
+    for result in results:
+        defines.current_section = result.id
+        for name, address in result.labels.items():
+            defines[name] = address
+    return defines
+
+
+def resolve_fixups(results):
+    """Patch the value of every label used into the sections' code.
+
+    results: The assembler.SectionResult of every section, their code is
+        replaced with the patched code.
+    """
+    defines = define_labels(results)
+    for result in results:
+        if not result.fixups:
+            continue
+        symbols = defines.section_defines[result.id]
+        code = bytearray(result.code)
+        for fixup in result.fixups:
+            try:
+                value = symbols[fixup.symbol]
+            except KeyError:
+                raise ResolutionError('Undefined label', fixup.symbol,
+                                      fixup.section) from None
+            field = FIELD_DESCRIPTORS[fixup.field]
+            try:
+                value = encode_field(field, value)
+            except EncodingError as error:
+                raise ResolutionError(*error.args, fixup.symbol) from error
+            offset = fixup.index * _WORD.size
+            word, = _WORD.unpack_from(code, offset)
+            word |= value << field.shift
+            _WORD.pack_into(code, offset, word)
+        result.code = bytes(code)
@@ -0,0 +1,176 @@
+"""Look-Ahead Left/Right 1 Action Table Generator.
+
+This uses the same LR(0) state graph as slr1, but each reduction only
+gets the lookahead symbols that can actually follow it in that state,
+instead of the whole FOLLOW set of the rule's head. The lookaheads are
+found with DeRemer and Pennello's relations over nonterminal
+transitions:
+
+    (p, A) reads (r, C)      r = goto(p, A) and C is nullable
+    (p, A) includes (q, B)   B -> x A y, y is nullable and q --x--> p
+    (q, A -> w) lookback (p, A)   p --w--> q
+
+Each relation is solved in linear time with digraph.
+"""
+
+
+__all__ = [
+    'generate_action_table',
+    ]
+
+
+from collections import defaultdict
+
+from cfg import (
+    Action,
+    ActionTable,
+    )
+from slr1 import (
+    add_shift_and_done_operations,
+    changed_rule_nullable,
+    index_rules_by_child,
+    make_state_graph,
+    over_rules_worklist,
+    SymbolData,
+    )
+
+
+def generate_action_table(symbols, starting_symbol, rules):
+    rules = list(rules)
+    symbol_data = make_nullable_data(rules)
+    state_graph = make_state_graph(
+        symbols, starting_symbol, rules, symbol_data)
+    lookaheads = make_lookaheads(state_graph, rules, symbol_data)
+    return make_action_table(state_graph, symbols, lookaheads)
+
+
+def make_nullable_data(rules):
+    """Get a SymbolData with only the nullable flags filled in."""
+    symbol_data = SymbolData()
+    over_rules_worklist(changed_rule_nullable, rules, symbol_data,
+                        index_rules_by_child(rules))
+    return symbol_data
+
+
+def make_lookaheads(graph, rules, symbol_data):
+    """Find the lookahead set of every reduction in graph.
+
+    return: Mapping from (state, rule) to the set of symbols on which
+        state reduces by rule.
+    """
+    transitions = [transitions for _, _, transitions in graph.iter_states()]
+    goto_ids = [(state, symbol)
+                for state, state_transitions in enumerate(transitions)
+                for symbol in state_transitions if symbol.is_nonterminal()]
+    goto_index = {goto: id for id, goto in enumerate(goto_ids)}
+
+    direct_reads, reads = make_reads(
+        transitions, goto_ids, goto_index, symbol_data)
+    read_sets = digraph(reads, direct_reads)
+    includes, lookback = make_includes_and_lookback(
+        transitions, goto_ids, goto_index, rules, symbol_data)
+    follow_sets = digraph(includes, read_sets)
+
+    lookaheads = defaultdict(set)
+    for key, goto_list in lookback.items():
+        for goto_id in goto_list:
+            lookaheads[key].update(follow_sets[goto_id])
+    return lookaheads
+
+
+def make_reads(transitions, goto_ids, goto_index, symbol_data):
+    direct_reads = []
+    reads = []
+    for state, symbol in goto_ids:
+        dst_transitions = transitions[transitions[state][symbol]]
+        direct_reads.append({target for target in dst_transitions
+                             if not target.is_nonterminal()})
+        reads.append([
+            goto_index[transitions[state][symbol], target]
+            for target in dst_transitions
+            if target.is_nonterminal() and symbol_data[target].nullable])
+    return direct_reads, reads
+
+
+def make_includes_and_lookback(transitions, goto_ids, goto_index,
+                               rules, symbol_data):
+    rules_by_head = defaultdict(list)
+    for rule in rules:
+        rules_by_head[rule.head].append(rule)
+
+    includes = [[] for _ in goto_ids]
+    lookback = defaultdict(list)
+    for goto_id, (start_state, head) in enumerate(goto_ids):
+        for rule in rules_by_head[head]:
+            nullable_tail = nullable_suffixes(rule, symbol_data)
+            state = start_state
+            for pos, symbol in enumerate(rule.children):
+                if symbol.is_nonterminal() and nullable_tail[pos + 1]:
+                    includes[goto_index[state, symbol]].append(goto_id)
+                state = transitions[state][symbol]
+            lookback[state, rule].append(goto_id)
+    return includes, lookback
+
+
+def nullable_suffixes(rule, symbol_data):
+    """For each position, is everything from there to the end nullable."""
+    suffixes = [True]
+    for symbol in reversed(rule.children):
+        suffixes.append(suffixes[-1] and symbol_data[symbol].nullable)
+    suffixes.reverse()
+    return suffixes
+
+
+def digraph(relation, initial):
+    """Solve F(x) = initial[x] | union(F(y) for y in relation[x]).
+
+    relation[x] lists the nodes x is related to and initial[x] is a set,
+    nodes are numbered from 0. Members of a strongly connected component
+    end up sharing one result set. Runs without recursion, so deep
+    relations don't hit the recursion limit.
+    """
+    size = len(relation)
+    finished = size + 1
+    result = [set(values) for values in initial]
+    depth = [0] * size
+    stack = []
+    for start in range(size):
+        if depth[start]:
+            continue
+        stack.append(start)
+        depth[start] = len(stack)
+        work = [(start, iter(relation[start]), len(stack))]
+        while work:
+            node, edges, node_depth = work[-1]
+            for target in edges:
+                if not depth[target]:
+                    stack.append(target)
+                    depth[target] = len(stack)
+                    work.append(
+                        (target, iter(relation[target]), len(stack)))
+                    break
+                depth[node] = min(depth[node], depth[target])
+                result[node].update(result[target])
+            else:
+                work.pop()
+                if depth[node] == node_depth:
+                    while True:
+                        top = stack.pop()
+                        depth[top] = finished
+                        if top == node:
+                            break
+                        result[top] = result[node]
+                if work:
+                    parent = work[-1][0]
+                    depth[parent] = min(depth[parent], depth[node])
+                    result[parent].update(result[node])
+    return result
+
+
+def make_action_table(graph, symbols, lookaheads):
+    action_table = ActionTable()
+    add_shift_and_done_operations(action_table, graph, symbols)
+    for (state, rule), lookahead in lookaheads.items():
+        for symbol in lookahead:
+            action_table[state, symbol] = Action.reduce(rule)
+    return action_table
@@ -1,18 +1,20 @@
 """Lines of code."""
 
 
+import mmap
 from pathlib import Path
 
 
-import node
-
-
 FIRST_ROW = 1
 FIRST_COL = 1
 
 
 class SourceFile:
-    """Wrapper around a source code file."""
+    """Wrapper around a source code file.
+
+    The file is read through a SourceBuffer, so lines are views into the
+    mapped file.
+    """
 
     def __init__(self, path):
         self.path = path
@@ -25,50 +27,85 @@ class SourceFile:
         """
         return SourceFile(Path(name).resolve())
 
-    def include(self, name):
+    def include(self, name, includes):
         """Include a new source file from this one.
 
-        Same as from_name, but if the file is not found, ties searching
-        from self's directory.
+        Same as from_name, but if the file is not found, tries searching
+        from self's directory. The search is done (and remembered) by
+        includes, an includes.IncludeManager.
         """
-        try:
-            return self.from_name(name)
-        except FileNotFoundError:
-            try:
-                return type(self)(Path(self.path.parent, name).resolve())
-            except FileNotFoundError:
-                pass
-            raise
-
-    def _iter_physical(self):
-        with self.path.open() as file:
-            for num, line in enumerate(file, start=FIRST_ROW):
-                yield PhysicalLine(line, str(self.path), num)
-
-    def __iter__(self):
-        """Return an iterator that produces each logical line in the file."""
-        for physical_line in iter_physical_lines(source_name):
-            yield LogicalLine([physical_line])
+        return type(self)(includes.resolve(name, self.path))
 
+    def open_buffer(self):
+        """Map the file into memory, use as a context manager."""
+        return SourceBuffer(self.path)
 
-class LogicalLine:
 
-    def __init__(self, physical):
-        self._physical = physical
+class SourceBuffer:
+    """A source file mapped into memory.
 
-    def __iter__(self):
-        # This one is not a mere loop, we break up the strings into
-        # non-terminal symbols as we go.
-        text = ' '.join(map(lambda l: l.strip_comment(), self._physical))
-        yield from node.iter_terminals_from_str(text)
+    data is an mmap of the file (or empty bytes for an empty file, which
+    cannot be mapped), valid until the buffer is closed.
+    """
 
+    def __init__(self, path):
+        self.path = path
+        with open(str(path), 'rb') as file:
+            try:
+                self.data = mmap.mmap(
+                    file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                self.data = b''
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def iter_physical(self):
+        """Produce a PhysicalSpan for each line in the buffer."""
+        find = self.data.find
+        size = len(self.data)
+        start = 0
+        num = FIRST_ROW
+        while start < size:
+            end = find(b'\n', start)
+            if end < 0:
+                end = size
+            yield PhysicalSpan(self, start, end, num)
+            start = end + 1
+            num += 1
+
+
+class PhysicalSpan:
+    """A physical line stored as the span [start, end) of a SourceBuffer.
+
+    The line's text is only copied out of the buffer if asked for, the
+    end of line is not included.
+    """
+
+    __slots__ = ('buffer', 'start', 'end', 'line_number')
+
+    def __init__(self, buffer, start, end, line_number):
+        self.buffer = buffer
+        self.start = start
+        self.end = end
+        self.line_number = line_number
 
-class PhysicalLine:
+    @property
+    def file_name(self):
+        return str(self.buffer.path)
 
-    def __init__(self, text, file_name, line_number):
-        self.text = text
-        self.file_name = file_name
-        self.line_number = line_number
+    @property
+    def text(self):
+        return self.buffer.data[self.start:self.end].decode()
 
-    def strip_comment(self) -> str:
-        return self.text.split(';', 1)[0]
+    def code_end(self):
+        """The end of the line's span with any comment removed."""
+        comment = self.buffer.data.find(b';', self.start, self.end)
+        return self.end if comment < 0 else comment
@@ -7,7 +7,9 @@ and the op code each repersents.
 
 
 __all__ = [
+    'ALL_OPERATIONS',
     'OPERATIONS',
+    'OPERATION_INDEX',
     'CAPTAIN_OPS',
     'MORTAR_OPS',
     'SNIPER_OPS',
@@ -16,11 +18,20 @@ __all__ = [
     'MACHINEGUNNER_OPS',
     'SCOUT_OPS',
     'SECTION_OPS',
+    'allowed_in_section',
+    'iter_section_operations',
+    'compile_format',
+    'FIELD_DESCRIPTORS',
+    'FIELDS',
+    'FieldDescriptor',
+    'FormatDescriptor',
     'OpCodeMapping',
+    'OpData',
     ]
 
 
-from itertools import chain, repeat
+from collections import namedtuple
+from itertools import chain, product, repeat
 from typing import Mapping, Optional, FrozenSet
 
 from _op_code import (
@@ -38,26 +49,129 @@ from _op_code import (
     )
 
 
+# Field letter (see _op_code) to (shift, width in bits, is signed).
+FIELDS = {
+    'O': (25, 7, False),
+    'A': (20, 5, False),
+    'B': (15, 5, False),
+    'C': (10, 5, False),
+    'S': (0, 10, True),
+    'I': (0, 20, False),
+    'L': (0, 32, False),
+    }
+
+
+class FieldDescriptor(namedtuple('FieldDescriptor', [
+        'letter', 'shift', 'width', 'signed', 'register',
+        'low', 'high', 'mask'])):
+    """How one field of an instruction is stored.
+
+    register: True if the field holds a register number, False if it
+        holds an immediate value.
+    low, high: The smallest and largest value the field can hold.
+    mask: Mask of the field's width, applied before shifting.
+    """
+
+    __slots__ = ()
+
+
+def _field_descriptor(letter):
+    shift, width, signed = FIELDS[letter]
+    if signed:
+        low, high = -(1 << (width - 1)), (1 << (width - 1)) - 1
+    else:
+        low, high = 0, (1 << width) - 1
+    return FieldDescriptor(letter, shift, width, signed, letter in 'ABC',
+                           low, high, (1 << width) - 1)
+
+
+FIELD_DESCRIPTORS = {letter: _field_descriptor(letter) for letter in FIELDS}
+
+
+class FormatDescriptor(namedtuple('FormatDescriptor', [
+        'format', 'arity', 'required_mask', 'fields'])):
+    """A compiled instruction format.
+
+    format: The format string it was compiled from.
+    arity: The most arguments an instruction can take.
+    required_mask: Bit i is set if argument i is required (written in
+        upper case in the format). It is not enforced yet, arguments
+        left off the end are encoded as r0 or 0.
+    fields: The FieldDescriptor of each argument, in order.
+    """
+
+    __slots__ = ()
+
+
+_FORMATS = {}
+
+
+def compile_format(format):
+    """Get the shared FormatDescriptor for a format string."""
+    descriptor = _FORMATS.get(format)
+    if descriptor is None:
+        required_mask = 0
+        for index, letter in enumerate(format):
+            if letter.isupper():
+                required_mask |= 1 << index
+        descriptor = _FORMATS[format] = FormatDescriptor(
+            format, len(format), required_mask,
+            tuple(FIELD_DESCRIPTORS[letter.upper()] for letter in format))
+    return descriptor
+
+
 class OpData:
     """Stores information about the operation.
 
+    name: The operation's name, in upper case.
     op_code: The integer value that repersents the operation. Pseudo-
         operations that don't repersent a particular command store
         None instead.
-    format: The layout of the regesters and imediate values the command
-        stores and how they can be presented in code.
+    descriptor: The FormatDescriptor of the layout of the regesters and
+        imediate values the command stores.
+    index: The operation's bit in the section bitmaps (see SECTION_OPS).
+        The op code, or for pseudo-operations a number counting down
+        from the top of the 7-bit range.
     """
 
-    def __init__(self, op_code, format):
+    __slots__ = ('name', 'op_code', 'descriptor', 'index')
+
+    def __init__(self, name, op_code, format, index):
+        self.name = name
         self.op_code = op_code
-        self.format = format
+        self.descriptor = compile_format(format)
+        self.index = index
+
+    @property
+    def format(self):
+        """The format string, how the arguments can be presented in code."""
+        return self.descriptor.format
+
+
+# Every operation's OpData, so the tables all share the same objects.
+_OP_DATA = {}
+_NUM_OP_INDEXES = 128
+
+
+def _op_data(name, op_code, format):
+    op_data = _OP_DATA.get(name)
+    if op_data is None:
+        if op_code is None:
+            pseudo_count = sum(1 for data in _OP_DATA.values()
+                               if data.op_code is None)
+            index = _NUM_OP_INDEXES - 1 - pseudo_count
+        else:
+            index = op_code
+        assert all(data.index != index for data in _OP_DATA.values())
+        op_data = _OP_DATA[name] = OpData(name, op_code, format, index)
+    return op_data
 
 
 class OpCodeMapping(dict, Mapping[str, OpData]):
 
     def __init__(self, *source_mappings):
         super().__init__(map(
-            lambda kvp: (kvp[0], OpData(*kvp[1])),
+            lambda kvp: (kvp[0], _op_data(kvp[0], *kvp[1])),
             chain.from_iterable(map.items() for map in source_mappings)
             ))
 
@@ -65,14 +179,16 @@ class OpCodeMapping(dict, Mapping[str, OpData]):
 # TODO: Python 3.6 has the variable annotation, although I don't know
 # if they work quite like this.
 #OPERATIONS: FrozenSet[str]
-#CAPTAIN_OPS: OpCodeMapping
-#MORTAR_OPS: OpCodeMapping
-#SNIPER_OPS: OpCodeMapping
-#ENGINEER_OPS: OpCodeMapping
-#RIFLEMAN_OPS: OpCodeMapping
-#MACHINEGUNNER_OPS: OpCodeMapping
-#SCOUT_OPS: OpCodeMapping
-#SECTION_OPS: Mapping[int, OpCodeMapping]
+#OPERATION_INDEX: Mapping[str, OpData]
+#ALL_OPERATIONS: OpCodeMapping
+#CAPTAIN_OPS: int
+#MORTAR_OPS: int
+#SNIPER_OPS: int
+#ENGINEER_OPS: int
+#RIFLEMAN_OPS: int
+#MACHINEGUNNER_OPS: int
+#SCOUT_OPS: int
+#SECTION_OPS: Mapping[int, int]
 
 
 OPERATIONS = frozenset(
@@ -90,8 +206,46 @@ OPERATIONS = frozenset(
           ))
 
 
-def _unit_op_map(unit_operations):
-    return OpCodeMapping(
+ALL_OPERATIONS = OpCodeMapping(
+    _PSEUDO_OPERATIONS,
+    _BASIC_OPERATIONS,
+    _COMBAT_OPERATIONS,
+    _UPGRADE_OPERATIONS,
+    _CAPTAIN_OPERATIONS,
+    _MORTAR_OPERATIONS,
+    _SNIPER_OPERATIONS,
+    _ENGINEER_OPERATIONS,
+    _RIFLEMAN_OPERATIONS,
+    _MACHINEGUNNER_OPERATIONS,
+    _SCOUT_OPERATIONS,
+    )
+
+
+def _case_variants(name):
+    return map(''.join, product(*((char.upper(), char.lower())
+                                   for char in name)))
+
+
+# Every spelling of every operation name, in any mix of upper and lower
+# case, mapped to its OpData. Operation names are only three letters, so
+# that is 8 keys each, and looking up a name as written in the source is
+# a single probe with no case folding.
+OPERATION_INDEX = {
+    variant: op_data
+    for name, op_data in ALL_OPERATIONS.items()
+    for variant in _case_variants(name)
+    }
+
+
+def _bitmap(*source_mappings):
+    bitmap = 0
+    for name in chain.from_iterable(source_mappings):
+        bitmap |= 1 << ALL_OPERATIONS[name].index
+    return bitmap
+
+
+def _unit_ops(unit_operations):
+    return _bitmap(
         _PSEUDO_OPERATIONS,
         _BASIC_OPERATIONS,
         _COMBAT_OPERATIONS,
@@ -100,25 +254,40 @@ def _unit_op_map(unit_operations):
         )
 
 
-CAPTAIN_OPERATIONS = _unit_op_map(_CAPTAIN_OPERATIONS)
-MORTAR_OPERATIONS = _unit_op_map(_MORTAR_OPERATIONS)
-SNIPER_OPERATIONS = _unit_op_map(_SNIPER_OPERATIONS)
-ENGINEER_OPERATIONS = _unit_op_map(_ENGINEER_OPERATIONS)
-RIFLEMAN_OPERATIONS = _unit_op_map(_RIFLEMAN_OPERATIONS)
-MACHINEGUNNER_OPERATIONS = _unit_op_map(_MACHINEGUNNER_OPERATIONS)
-SCOUT_OPERATIONS = _unit_op_map(_SCOUT_OPERATIONS)
+# The operations each unit may use, as a bitmap with the bit of each
+# OpData.index set.
+CAPTAIN_OPS = _unit_ops(_CAPTAIN_OPERATIONS)
+MORTAR_OPS = _unit_ops(_MORTAR_OPERATIONS)
+SNIPER_OPS = _unit_ops(_SNIPER_OPERATIONS)
+ENGINEER_OPS = _unit_ops(_ENGINEER_OPERATIONS)
+RIFLEMAN_OPS = _unit_ops(_RIFLEMAN_OPERATIONS)
+MACHINEGUNNER_OPS = _unit_ops(_MACHINEGUNNER_OPERATIONS)
+SCOUT_OPS = _unit_ops(_SCOUT_OPERATIONS)
 
 
 SECTION_OPS = {
-    1: CAPTAIN_OPERATIONS,
-    2: MORTAR_OPERATIONS,
-    3: SNIPER_OPERATIONS,
-    4: ENGINEER_OPERATIONS,
-    5: ENGINEER_OPERATIONS,
-    6: MACHINEGUNNER_OPERATIONS,
-    7: MACHINEGUNNER_OPERATIONS,
-    8: SCOUT_OPERATIONS,
-    9: SCOUT_OPERATIONS,
-    10: RIFLEMAN_OPERATIONS,
-    11: RIFLEMAN_OPERATIONS,
+    0: 0,
+    1: CAPTAIN_OPS,
+    2: MORTAR_OPS,
+    3: SNIPER_OPS,
+    4: ENGINEER_OPS,
+    5: ENGINEER_OPS,
+    6: MACHINEGUNNER_OPS,
+    7: MACHINEGUNNER_OPS,
+    8: SCOUT_OPS,
+    9: SCOUT_OPS,
+    10: RIFLEMAN_OPS,
+    11: RIFLEMAN_OPS,
     }
+
+
+def allowed_in_section(op_data, section):
+    """Check if an operation may be used in a section."""
+    return SECTION_OPS[section] >> op_data.index & 1
+
+
+def iter_section_operations(section):
+    """Produce the OpData of each operation allowed in a section."""
+    bitmap = SECTION_OPS[section]
+    return (op_data for op_data in ALL_OPERATIONS.values()
+            if bitmap >> op_data.index & 1)
@@ -1,61 +1,96 @@
 #!/usr/bin/env python3
 
 
-# TODO:
-# I. Proof of Concept: Instructions with Regesters and Litterals.
-# 1. Tokenization: Text to Tokens.
-# 2. Grammer: Convert things into a Parse Tree
-# 3. IO: Read from source, print to output
-# II. Minimum Viable Product: Labels and Sections
-# 1. "Instructions Printed" Counter.
+# Roadmap, with where each finished step is done:
+# I. Proof of Concept: Instructions with Regesters and Litterals. (done)
+# 1. Tokenization: Text to Tokens. (grammar.py)
+# 2. Grammer: Convert things into a Parse Tree (grammar.py, syntax.py)
+# 3. IO: Read from source, print to output (lines.py, writer.py)
+# II. Minimum Viable Product: Labels and Sections (done)
+# 1. "Instructions Printed" Counter. (encoder.SectionEncoder's length)
 # 2. Label look-up
-# 2a. Scoped store for each section.
-# 2b. Forward reference resolution. (mark and backtrack?)
-# 3. Wrap as, feeding it a /tmp file with the processed code.
+# 2a. Scoped store for each section. (defines.py)
+# 2b. Forward reference resolution, by a second pass over a list of
+#     fixups instead of backtracking. (labels.py)
+# 3. Write the executable directly (writer.py), wrapping as only to
+#    verify the output (--verify-as).
 # III. Basic Replacement: "Here", Includes, Assignments and Math
-# 1. Interprate here as an integer.
-# 2. Support include directive.
-# 2a. Parsing might require a special case to get full names.
-# 2b. Splice in the code from that file.
-# 3. Add assignment store along side labels.
-# 4. Read and evaluate arthmatic expressions
+# TODO: 1. Interprate here as an integer.
+# 2. Support include directive. (done, includes.py)
+# 2a. The pre-scan reads the directive, so the grammar needs no names.
+# 2b. Splice in the code from that file. (assembler.prescan)
+# TODO: 3. Add assignment store along side labels.
+# TODO: 4. Read and evaluate arthmatic expressions
 # IV. Full Replacement: Error Messages and Imediate Substution.
-# 1. Tag internal structures with source text information.
-# 2. Determaine recoverable errors and how to recover.
-# 3. Imediate Substution, filling in 'I' when used and check for conflicts.
-# 4. Validate command input formats.
+# TODO: 1. Tag internal structures with source text information.
+#    Errors name the file and line, nothing else is tagged.
+# TODO: 2. Determaine recoverable errors and how to recover.
+# TODO: 3. Imediate Substution, filling in 'I' when used and check for
+#    conflicts.
+# 4. Validate command input formats. (encoder.SectionEncoder.add)
 # V. New Features:
 # I have ideas, but it is a bit far off right now.
 # 1. Dot values, special values like "." or ".section"
 
-# I'm just thinking about the main loop.
+# The main loop:
 # Setup:
-#   Create a store for definitions and any global settings.
 #   Parse and handle command line arguments.
-#   Open the main source file.
-# Loop:
-#   Get a logical line and (possibly recursively) parse it.
-#   Instructions should be dumped into the approprate section.
-#   Defines (labels and assignments) get added to the global definitions.
-#   Includes add to the stack of files to read from.
+#   Load the section cache if --incremental is given.
+# Pre-scan (assembler.prescan):
+#   Split the source into sections by its .section directives, splicing
+#   in included files. The include manager keeps the stack of files
+#   being read.
+# Assemble (assembler.assemble_sections):
+#   Parse, check and encode each unit section, possibly in parallel.
+#   Labels are collected per section and uses of them left as fixups.
 # Cleanup:
-#   Writing to the executable probably has to wait for now, to make sure
-#   each section is full and all forward references are filled. Plus the
-#   typical cleanup.
+#   Resolve the fixups once every section is assembled, write the
+#   executable, then save the cache.
 
 
 import argparse
+import sys
 
+from assembler import assemble_file
+import instrument
+from incremental import (
+    default_cache_path,
+    SectionCache,
+    )
 from lines import SourceFile
 
 
 def main(argv=None):
     args = parse_args(argv)
-    # I'm going to need a stack of these.
-    for line in SourceFile(args.source):
-        print('New line')
-        for terminal in line:
-            print('', terminal.symbol, terminal.text)
+    source = SourceFile.from_name(args.source)
+    if args.incremental:
+        section_cache = SectionCache.load(default_cache_path(source.path))
+    else:
+        section_cache = None
+    if args.timings is not None:
+        instrument.start(trace_memory=args.profile)
+    try:
+        assemble_file(source, args.output, args.jobs, section_cache,
+                      args.listing, args.verify_as)
+    finally:
+        recorder = instrument.stop()
+        if recorder is not None:
+            write_timings(recorder, args.timings, args.timings_file)
+    if section_cache is not None:
+        section_cache.save()
+
+
+def write_timings(recorder, format, path=None):
+    """Write what recorder recorded to path, or stderr."""
+    file = sys.stderr if path is None else open(path, 'w')
+    try:
+        if format == 'json':
+            recorder.write_json(file)
+        else:
+            recorder.write_text(file)
+    finally:
+        if path is not None:
+            file.close()
 
 
 def parse_args(argv=None):
@@ -63,8 +98,34 @@ def parse_args(argv=None):
         description='Recuriter is a Von Neumann Standing Compiler')
     parser.add_argument('source', help='The source file to assemble.')
     parser.add_argument('output', help='The output file to write to.')
-    # For II) parser.add_argument('--as', help='Underlying compiler.')
-    return parser.parse_args(argv)
+    parser.add_argument('--incremental', action='store_true',
+        help='Reuse the sections unchanged since the last run.')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+        help='Number of processes to assemble sections with, 0 for one'
+             ' per processor.')
+    parser.add_argument('--listing',
+        help='Also write the assembled instructions as text to this file.')
+    parser.add_argument('--verify-as', metavar='AS',
+        help='Check the output against the image made by the as'
+             ' compiler. AS is its command line, with {source} and'
+             ' {output} standing for the files it reads and writes, or'
+             ' just the program if it takes them in that order.')
+    parser.add_argument('--timings', nargs='?', const='text',
+        choices=['text', 'json'],
+        help='Report the time spent in each phase, per source file.'
+             ' Building instruction arguments is counted in encode, not'
+             ' syntax.')
+    parser.add_argument('--profile', action='store_true',
+        help='Like --timings, also recording the memory each phase'
+             ' allocates. Slower.')
+    parser.add_argument('--timings-file',
+        help='File to write the timings to, instead of stderr.')
+    args = parser.parse_args(argv)
+    if args.profile and args.timings is None:
+        args.timings = 'text'
+    if args.jobs == 0:
+        args.jobs = None
+    return args
 
 
 if __name__ == '__main__':
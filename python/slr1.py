@@ -2,6 +2,7 @@
 
 
 __all__ = [
+    'ClosureIndex',
     'generate_action_table',
     ]
 
@@ -40,10 +41,13 @@ class SymbolDataEntry:
 def make_symbol_data(symbols, starting_symbol, rules):
     symbol_data = SymbolData()
     fill_terminals_first_set(symbols, symbol_data)
-    #? symbol_data[starting_symbol].follow_set.add(get_eof_symbol(symbols))
-    over_rules_until_false(update_rule_nullable, rules, symbol_data)
-    over_rules_until_false(update_rule_first_set, rules, symbol_data)
-    over_rules_until_false(update_rule_follow_set, rules, symbol_data)
+    symbol_data[starting_symbol].follow_set.add(get_eof_symbol(symbols))
+    rules = list(rules)
+    readers = index_rules_by_child(rules)
+    over_rules_worklist(changed_rule_nullable, rules, symbol_data, readers)
+    over_rules_worklist(changed_rule_first_set, rules, symbol_data, readers)
+    over_rules_worklist(changed_rule_follow_sets, rules, symbol_data,
+                        index_rules_by_head(rules))
     return symbol_data
 
 
@@ -98,6 +102,20 @@ def rule_follow_set(rule, symbol_data):
     return follow_sets
 
 
+def changed_rule_nullable(rule, symbol_data):
+    return (rule.head,) if update_rule_nullable(rule, symbol_data) else ()
+
+
+def changed_rule_first_set(rule, symbol_data):
+    return (rule.head,) if update_rule_first_set(rule, symbol_data) else ()
+
+
+def changed_rule_follow_sets(rule, symbol_data):
+    new_follow_sets = rule_follow_set(rule, symbol_data)
+    return [symbol for symbol, new_set in new_follow_sets.items()
+            if does_update_set(symbol_data[symbol].follow_set, new_set)]
+
+
 def does_update_set(dst_set, src_set):
     if dst_set.issuperset(src_set):
         return False
@@ -106,10 +124,47 @@ def does_update_set(dst_set, src_set):
 
 
 def over_rules_until_false(callable, rules, symbol_data):
+    # Replaced by over_rules_worklist, kept as the baseline for
+    # benchmarks.bench_symbol_data.
     while any(callable(rule, symbol_data) for rule in rules):
         pass
 
 
+def over_rules_worklist(callable, rules, symbol_data, dependents):
+    """Update symbol_data from the rules until it stops changing.
+
+    callable(rule, symbol_data) updates symbol_data and returns the
+    symbols whose entries it changed. dependents maps a symbol to the
+    indices of the rules that read its entry, only those rules are
+    visited again after it changes.
+    """
+    pending = list(range(len(rules)))
+    queued = [True] * len(rules)
+    while pending:
+        index = pending.pop()
+        queued[index] = False
+        for symbol in callable(rules[index], symbol_data):
+            for dependent in dependents.get(symbol, ()):
+                if not queued[dependent]:
+                    queued[dependent] = True
+                    pending.append(dependent)
+
+
+def index_rules_by_child(rules):
+    index = defaultdict(list)
+    for rule_id, rule in enumerate(rules):
+        for symbol in set(rule.children):
+            index[symbol].append(rule_id)
+    return index
+
+
+def index_rules_by_head(rules):
+    index = defaultdict(list)
+    for rule_id, rule in enumerate(rules):
+        index[rule.head].append(rule_id)
+    return index
+
+
 # TODO: Python3.6's typing.NamedTuple
 _Item = namedtuple('_Item', ['rule', 'pos'])
 class Item(_Item):
@@ -146,20 +201,23 @@ class StateGraph:
     def __init__(self):
         # : Sequence[Tuple[Label, MutableMapping[Symbol, int]]]
         self._states = []
+        # : MutableMapping[Label, int], the id of each state in _states.
+        self._index = {}
+
+    def add_state(self, label):
+        id = len(self._states)
+        self._states.append((label, {}))
+        self._index[label] = id
+        return id
 
     def default_lookup(self, label):
         try:
-            return self.lookup(label)
+            return self._index[label]
         except KeyError:
-            id = len(self._states)
-            self._states.append((label, {}))
-            return id
+            return self.add_state(label)
 
     def lookup(self, label):
-        for state_id, (state_label, _) in enumerate(self._states):
-            if state_label == label:
-                return state_id
-        raise KeyError(label)
+        return self._index[label]
 
     def label_of(self, state):
         return self._states[state][0]
@@ -183,8 +241,9 @@ class StateGraph:
 def make_state_graph(symbols, starting_symbol, rules, symbol_data):
     graph = StateGraph()
     imaginary_rule = make_imaginary_rule(symbols, starting_symbol)
-    insert_starting_state(graph, imaginary_rule, rules)
-    fill_state_graph(graph, symbols, rules)
+    closures = ClosureIndex(rules)
+    insert_starting_state(graph, imaginary_rule, closures)
+    fill_state_graph(graph, symbols, closures)
     return graph
 
 
@@ -200,20 +259,32 @@ def insert_starting_state(graph, imaginary_rule, rules):
 
 
 def fill_state_graph(graph, symbols, rules):
-    for state in graph.iter_state_ids():
-        for symbol in symbols:
-            build_transition(graph, rules, state, symbol)
+    """Add every state reachable from the states already in graph.
 
+    Only symbols that some item of a state is waiting on get a
+    transition, in the order they appear in symbols.
+    """
+    closures = as_closure_index(rules)
+    order = {symbol: index for index, symbol in enumerate(symbols)}
+    for state in graph.iter_state_ids():
+        kernals = group_by_next_symbol(graph.label_of(state))
+        for symbol in sorted(kernals, key=order.__getitem__):
+            dst_state = graph.default_lookup(
+                closures.fill(Label(kernals[symbol])))
+            graph.add_transition(state, symbol, dst_state)
 
-def build_transition(graph, rules, state, symbol):
-    dst_label = find_destination_label(rules, graph.label_of(state), symbol)
-    if dst_label:
-        dst_state = graph.default_lookup(dst_label)
-        graph.add_transition(state, symbol, dst_state)
 
+def group_by_next_symbol(label):
+    """Shift every unfinished item in label, grouped by the shifted symbol.
 
-def find_destination_label(rules, source_label, symbol):
-    return fill_kernal_label(rules, shift_all(source_label, symbol))
+    return: Mapping from symbol to a list of the shifted items.
+    """
+    kernals = defaultdict(list)
+    for item in label:
+        symbol = item.next_symbol()
+        if symbol is not None:
+            kernals[symbol].append(item.next_item())
+    return kernals
 
 
 def shift_all(label, symbol):
@@ -222,14 +293,60 @@ def shift_all(label, symbol):
 
 
 def fill_kernal_label(rules, kernal_label):
-    new_label_rules = list(kernal_label)
-    for item in new_label_rules:
-        symbol = item.next_symbol()
-        if symbol is not None and symbol.is_nonterminal():
-            for rule in filter(lambda r: r.head == symbol, rules):
-                if rule not in new_label_rules:
-                    new_label_rules.append(Item(rule))
-    return Label(new_label_rules)
+    """Add the closure of every item in kernal_label to it.
+
+    rules may be a ClosureIndex, otherwise one is built from it.
+    """
+    return as_closure_index(rules).fill(kernal_label)
+
+
+def as_closure_index(rules):
+    if isinstance(rules, ClosureIndex):
+        return rules
+    return ClosureIndex(rules)
+
+
+class ClosureIndex:
+    """Rules indexed by head symbol, with memoized nonterminal closures.
+
+    The closure of a nonterminal is the set of starting Items for its
+    rules, and for the rules of every nonterminal that can begin them.
+    Filling a kernal label is then a union of closures.
+    """
+
+    def __init__(self, rules):
+        self._by_head = defaultdict(list)
+        for rule in rules:
+            self._by_head[rule.head].append(rule)
+        self._closures = {}
+
+    def closure_of(self, symbol):
+        try:
+            return self._closures[symbol]
+        except KeyError:
+            pass
+        items = set()
+        seen = {symbol}
+        pending = [symbol]
+        while pending:
+            for rule in self._by_head.get(pending.pop(), ()):
+                items.add(Item(rule))
+                if rule.children:
+                    first = rule.children[0]
+                    if first.is_nonterminal() and first not in seen:
+                        seen.add(first)
+                        pending.append(first)
+        closure = frozenset(items)
+        self._closures[symbol] = closure
+        return closure
+
+    def fill(self, kernal_label):
+        items = set(kernal_label)
+        for item in kernal_label:
+            symbol = item.next_symbol()
+            if symbol is not None and symbol.is_nonterminal():
+                items.update(self.closure_of(symbol))
+        return Label(items)
 
 
 class Label(frozenset):
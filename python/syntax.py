@@ -1,11 +1,14 @@
 """Syntax Nodes and conversion from parse tree to syntax tree."""
 
 
+import sys
+
+from cfg import TerminalNode
 from grammar import (
     VNSSymbols,
     )
 from op_code import (
-    SECTION_OPERATIONS,
+    OPERATION_INDEX,
     )
 
 
@@ -30,6 +33,8 @@ class SyntaxNode:
 
     # __new__ as node type dispatcher?
 
+    __slots__ = ('parse_node',)
+
     def __init__(self, parse_node):
         self.parse_node = parse_node
 
@@ -44,77 +49,82 @@ class SyntaxNode:
             type(self).__name__, self.parse_node)
 
 
-class OperationNode(SyntaxNode):
+class LabelNode(SyntaxNode):
+    """A line with only a label on it."""
+
+    __slots__ = ('label',)
 
     def __init__(self, parse_node):
         super().__init__(parse_node)
-        self.operation = parse_node.children[0]
-        self.args = self._build_args(self.parse_node)
-
-    @classmethod
-    def _build_args(cls, node):
-        arg_list = []
-        for child in parse_node.children:
-            if VNSSymbols.ARGUMENT is child.symbol:
-                arg_list.append(to_node(child))
-            elif VNSSymbols.ARG_TAIL is child.symbol:
-                arg_list.extend(cls._build_args(child))
-        return arg_list
+        self.label = _label_name(parse_node.children[0])
 
     def __str__(self):
-        return str(self.operation) + ' ' + ', '.join(map(str, self.args))
-
-
-def _get_register_default(args, i):
-    try:
-        return args[i]
-    except IndexError:
-        # Construct a fake 'r0' value.
-        return None
+        return self.label + ':'
 
 
-def _get_immediate_default(args, i):
-    try:
-        return args[i]
-    except IndexError:
-        # Construct a fake '0' value.
-        return None
+class OperationNode(SyntaxNode):
+    """A line with an instruction on it.
 
+    The label and operation are read when the node is created, the
+    arguments only when args is first used, so passes that only need to
+    know what the instruction is skip them. The assembler lists and
+    encodes every argument of every line, so it builds them all anyway,
+    for it this only changes when the work is done, not how much.
+    """
 
-class OperationABCSNode(OperationNode):
+    __slots__ = ('label', 'operation', 'op_data', '_args')
 
-    def __init__(self, parse_node):
+    def __init__(self, parse_node, op_data=None):
         super().__init__(parse_node)
+        children = parse_node.children
+        if len(children) == 3:
+            self.label = _label_name(children[0])
+        else:
+            self.label = None
+        self.operation = children[-2].children[0].text
+        if op_data is None:
+            op_data = OPERATION_INDEX[self.operation]
+        self.op_data = op_data
 
     @property
-    def register_a(self):
-        return _get_register_default(self.args, 0)
-
-    @property
-    def register_b(self):
-        return _get_register_default(self.args, 1)
+    def operation_name(self):
+        """The operation in the case used by the op_code tables."""
+        return self.op_data.name
 
     @property
-    def register_c(self):
-        return _get_register_default(self.args, 2)
-
-    @property
-    def small_immediate(self):
-        return _get_immediate_default(self.args, 3)
-
-
-class OperationAINode(OperationNode):
+    def args(self):
+        """The syntax nodes of the arguments, created on first use."""
+        try:
+            return self._args
+        except AttributeError:
+            self._args = self._build_args(self.parse_node.children[-1])
+            return self._args
+
+    @staticmethod
+    def _build_args(node):
+        # Follows the ARG_TAIL chain in a loop instead of recursing.
+        arg_list = []
+        while node is not None:
+            tail = None
+            for child in node.children:
+                if VNSSymbols.ARGUMENT is child.symbol:
+                    arg_list.append(to_node(child))
+                elif VNSSymbols.ARG_TAIL is child.symbol:
+                    tail = child
+            node = tail
+        return arg_list
 
-    def __init__(self, parse_node):
-        super().__init__(parse_node)
+    def __str__(self):
+        text = self.operation
+        if self.args:
+            text += ' ' + ', '.join(map(str, self.args))
+        if self.label is not None:
+            text = self.label + ': ' + text
+        return text
 
-    @property
-    def register_a(self):
-        return _get_register_default(self.args, 0)
 
-    @property
-    def immediate(self):
-        return _get_immediate_default(self.args, 1)
+def _label_name(label_node):
+    return label_node.children[0].text
 
 
 #   if 'A' in self.format:
@@ -136,21 +146,32 @@ class OperationAINode(OperationNode):
 #       elif ch in 'Bb':
 #           self.register_b = RegisterGetter(1, optional=ch.islower())
 
-# I am just making things up for a bit...
-# Haha, no, this is Python3.6 stuff!
 class ArgumentGetter:
+    """Gets one argument of an operation, by its place in the arguments.
+
+    The argument is looked up the first time it is used and cached in the
+    owner's slot of the same name with a leading underscore. An argument
+    left off the end of the instruction is r0 for a register and 0 for an
+    immediate, as the encoder writes it.
+    """
 
     def __init__(self, format_char, place):
         self.format_char = format_char
         self.place = place
 
     def __get__(self, instance, owner):
-        if not hasattr(instance, self.key):
-            try:
-                setattr(instance, self.key, instance.args[self.place])
-            except IndexError:
-                setattr(instance, self.key, self._make_default())
-        return getattr(instance, self.key)
+        if instance is None:
+            return self
+        try:
+            return getattr(instance, self.key)
+        except AttributeError:
+            pass
+        try:
+            value = instance.args[self.place]
+        except IndexError:
+            value = self._make_default()
+        setattr(instance, self.key, value)
+        return value
 
     # Is 'set' actually allowed?
     def __set__(self, instance, value):
@@ -162,7 +183,9 @@ class ArgumentGetter:
         self.key = '_' + name
 
     def _make_default(self):
-        raise NotImplementedError()
+        if self.format_char.upper() in 'ABC':
+            return _DEFAULT_REGISTER
+        return _DEFAULT_INTEGER
 
 
 # OK, what do I need:
@@ -172,17 +195,87 @@ class ArgumentGetter:
 # - A default value, or generator of defaults, for optional arguments.
 
 
+class OperationABCSNode(OperationNode):
+
+    __slots__ = ('_register_a', '_register_b', '_register_c',
+                 '_small_immediate')
+
+    register_a = ArgumentGetter('A', 0)
+    register_b = ArgumentGetter('B', 1)
+    register_c = ArgumentGetter('C', 2)
+    small_immediate = ArgumentGetter('S', 3)
+
+
+class OperationAINode(OperationNode):
+
+    __slots__ = ('_register_a', '_immediate')
+
+    register_a = ArgumentGetter('A', 0)
+    immediate = ArgumentGetter('I', 1)
+
+
 class TerminalSyntaxNode(SyntaxNode):
 
+    __slots__ = ()
+
     def __str__(self):
         return self.parse_node.text
 
 
 class RegisterNode(TerminalSyntaxNode):
-    pass
+
+    __slots__ = ()
+
+    @property
+    def number(self):
+        return int(self.parse_node.text[1:])
 
 
 class IntegerNode(TerminalSyntaxNode):
 
+    __slots__ = ()
+
     def __int__(self):
         return int(str(self))
+
+
+class IdentifierNode(TerminalSyntaxNode):
+
+    __slots__ = ()
+
+
+# Stand-ins for arguments left off, they are not from any source text.
+_DEFAULT_REGISTER = RegisterNode(TerminalNode(VNSSymbols.Register, 'r0'))
+_DEFAULT_INTEGER = IntegerNode(TerminalNode(VNSSymbols.Integer, '0'))
+
+
+def _line_node(parse_node):
+    if VNSSymbols.LABEL is parse_node.children[-1].symbol:
+        return LabelNode(parse_node)
+    op_data = OPERATION_INDEX[parse_node.children[-2].children[0].text]
+    node_type = _format_node_types.get(op_data.format, OperationNode)
+    return node_type(parse_node, op_data)
+
+
+def _argument_node(parse_node):
+    terminal = parse_node.children[0]
+    return _terminal_node_types[terminal.symbol](terminal)
+
+
+_format_node_types = {
+    'ABCS': OperationABCSNode,
+    'AI': OperationAINode,
+    }
+
+
+_terminal_node_types = {
+    VNSSymbols.Register: RegisterNode,
+    VNSSymbols.Integer: IntegerNode,
+    VNSSymbols.Identifier: IdentifierNode,
+    }
+
+
+_symbol_node_types.update({
+    VNSSymbols.START: _line_node,
+    VNSSymbols.ARGUMENT: _argument_node,
+    })
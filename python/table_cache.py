@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""Persistent cache for generated action tables.
+
+Generating an action table means building the whole state graph and the
+FIRST/FOLLOW sets, which is far more work than loading the result. The
+compiled table is pickled to a cache directory along with a key hashed
+from the grammar's symbols and rules and the source code of the modules
+that generate and compile it. If the key no longer matches (or the file
+is missing or unreadable) the table is generated again and the cache
+rewritten.
+
+Running this file regenerates the cached tables for the VNS grammar.
+"""
+
+
+__all__ = [
+    'default_cache_dir',
+    'grammar_key',
+    'load_compiled_table',
+    'read_pickle',
+    'source_digest',
+    'write_pickle',
+    ]
+
+
+import argparse
+import hashlib
+import importlib
+import os
+from pathlib import Path
+import pickle
+
+import cfg
+
+
+# Increase whenever the cache file layout changes.
+CACHE_VERSION = 1
+
+
+# Modules every generated table depends on, along with its generator's
+# own module. The generators all build on slr1, and cfg holds
+# CompiledActionTable.
+SOURCE_MODULES = ('cfg', 'slr1')
+
+
+def default_cache_dir():
+    """Get the directory cache files are stored in.
+
+    RECRUITER_CACHE_DIR overrides the default location, which is a
+    recruiter directory in the user's cache directory.
+    """
+    if 'RECRUITER_CACHE_DIR' in os.environ:
+        return Path(os.environ['RECRUITER_CACHE_DIR'])
+    base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(base, 'recruiter')
+
+
+def _module_source(name):
+    with open(importlib.import_module(name).__file__, 'rb') as file:
+        return file.read()
+
+
+def source_digest(module_names):
+    """Hash the source code of the named modules."""
+    hasher = hashlib.sha256()
+    for name in module_names:
+        hasher.update(_module_source(name))
+    return hasher.hexdigest()
+
+
+def grammar_key(symbols, starting_symbol, rules, generator):
+    """Hash everything that the generated table depends on."""
+    hasher = hashlib.sha256()
+    hasher.update(source_digest(
+        (generator.__module__,) + SOURCE_MODULES).encode('ascii'))
+    parts = [
+        CACHE_VERSION,
+        generator.__module__,
+        generator.__qualname__,
+        starting_symbol.name,
+        [(symbol.name, symbol._symbol_kind) for symbol in symbols],
+        [(rule.head.name, [child.name for child in rule.children])
+         for rule in rules],
+        ]
+    hasher.update(repr(parts).encode('utf-8'))
+    return hasher.hexdigest()
+
+
+def load_compiled_table(name, symbols, starting_symbol, rules, generator,
+                        cache_dir=None, regenerate=False):
+    """Get a CompiledActionTable from the cache, generating it if needed.
+
+    name: File name (without extension) of the table in the cache.
+    symbols, starting_symbol, rules: The grammar, as passed to generator.
+    generator: Function that creates an ActionTable from the grammar,
+        such as slr1.generate_action_table.
+    cache_dir: Directory to store the table in, default_cache_dir() if
+        not given.
+    regenerate: Always generate the table, replacing any cached copy.
+    """
+    key = grammar_key(symbols, starting_symbol, rules, generator)
+    if cache_dir is None:
+        cache_dir = default_cache_dir()
+    path = Path(cache_dir, name + '.table')
+    if not regenerate:
+        table = _read_cache(path, key)
+        if table is not None:
+            return table
+    table = cfg.CompiledActionTable(
+        generator(symbols, starting_symbol, rules), symbols)
+    _write_cache(path, key, table)
+    return table
+
+
+def _read_cache(path, key):
+    data = read_pickle(path)
+    if not isinstance(data, dict) or data.get('key') != key:
+        return None
+    return data.get('table')
+
+
+def _write_cache(path, key, table):
+    write_pickle(path, {'key': key, 'table': table})
+
+
+def read_pickle(path):
+    """Load a pickled cache file, or get None if it can't be read."""
+    try:
+        with path.open('rb') as file:
+            return pickle.load(file)
+    except (OSError, EOFError, pickle.UnpicklingError,
+            AttributeError, ImportError, ValueError):
+        return None
+
+
+def write_pickle(path, data):
+    """Pickle data to a cache file, creating its directory if needed.
+
+    The data is written to a temporary file that is then renamed, so
+    concurrent runs never see half a file. Failing to write only costs
+    the work of regenerating the data next time, so it is ignored.
+    """
+    temp_path = path.with_name('{}.{}.tmp'.format(path.name, os.getpid()))
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with temp_path.open('wb') as file:
+            pickle.dump(data, file, pickle.HIGHEST_PROTOCOL)
+        os.replace(str(temp_path), str(path))
+    except OSError:
+        try:
+            temp_path.unlink()
+        except OSError:
+            pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Regenerate the cached VNS action tables.')
+    parser.add_argument('--cache-dir', help='Directory to store tables in.')
+    args = parser.parse_args(argv)
+    import grammar
+    grammar.load_compiled_table(cache_dir=args.cache_dir, regenerate=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,17 @@
+"""Tests of the Python implementation of Recruiter.
+
+Importing grammar loads (and if needed writes) the cached action table,
+so the cache is moved to a temporary directory before any test module
+is imported.
+"""
+
+
+import atexit
+import os
+import shutil
+import tempfile
+
+
+_cache_dir = tempfile.mkdtemp(prefix='recruiter-test-cache-')
+atexit.register(shutil.rmtree, _cache_dir, ignore_errors=True)
+os.environ['RECRUITER_CACHE_DIR'] = _cache_dir
@@ -0,0 +1,97 @@
+"""Testing of the section by section assembler."""
+
+
+from pathlib import Path
+import tempfile
+import unittest
+
+from assembler import (
+    assemble_section,
+    assemble_sections,
+    AssemblyError,
+    prescan,
+    Section,
+    )
+from incremental import SectionCache
+from lines import SourceBuffer
+
+
+SOURCE_TEXT = '''\
+; Shared definitions go here.
+.section 1
+ADD r1, r2, r3, 4 ; add
+cap
+.section 3
+JIZ r3, 7
+.section 1
+LIN
+'''
+
+
+class TestAssembler(unittest.TestCase):
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.temp_dir = temp_dir.name
+
+    def prescan_text(self, text):
+        path = Path(self.temp_dir, 'source.vns')
+        path.write_text(text)
+        with SourceBuffer(path) as buffer:
+            return prescan(buffer)
+
+    def test_prescan(self):
+        sections = self.prescan_text(SOURCE_TEXT)
+        self.assertEqual(12, len(sections))
+        self.assertEqual([], sections[0].lines)
+        self.assertEqual([b'ADD r1, r2, r3, 4', b'cap', b'LIN'],
+                         sections[1].lines)
+        self.assertEqual([3, 4, 8], sections[1].line_numbers)
+        self.assertEqual([b'JIZ r3, 7'], sections[3].lines)
+
+    def test_prescan_bad_directive(self):
+        for text in ['.sector 1\n', '.section\n', '.section 12\n']:
+            with self.assertRaises(AssemblyError):
+                self.prescan_text(text)
+
+    def test_assemble_section(self):
+        sections = self.prescan_text(SOURCE_TEXT)
+        result = assemble_section(sections[1])
+        self.assertEqual(1, result.id)
+        self.assertEqual(['ADD r1, r2, r3, 4', 'cap', 'LIN'], result.listing)
+
+    def test_instructions_in_shared_section(self):
+        section = Section(0)
+        section.add_line(1, b'CAP')
+        with self.assertRaises(AssemblyError):
+            assemble_section(section)
+
+    def test_too_many_arguments(self):
+        section = Section(2)
+        section.add_line(1, b'CAP r1')
+        with self.assertRaises(AssemblyError):
+            assemble_section(section)
+
+    def test_syntax_errors_name_line(self):
+        for text, line_number in [('CAP\nADD r1 r2\n', 3),
+                                  ('CAP\nCAP\nLIN @\n', 4)]:
+            sections = self.prescan_text('.section 1\n' + text)
+            with self.assertRaises(AssemblyError) as context:
+                assemble_section(sections[1])
+            self.assertEqual(
+                (1, str(Path(self.temp_dir, 'source.vns').resolve()),
+                 line_number),
+                context.exception.args[-3:])
+
+    def test_parallel_matches_serial(self):
+        sections = self.prescan_text(SOURCE_TEXT)
+        cache = SectionCache(Path(self.temp_dir, 'source.sections'))
+        serial = assemble_sections(sections)
+        cached = assemble_sections(sections, section_cache=cache)
+        parallel = assemble_sections(sections, jobs=2)
+        def fields(results):
+            return [(result.id, result.listing, result.code)
+                    for result in results]
+        for results in [cached, parallel]:
+            self.assertEqual(fields(serial), fields(results))
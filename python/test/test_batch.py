@@ -0,0 +1,86 @@
+"""Testing of batch assembly."""
+
+
+from contextlib import redirect_stderr
+from pathlib import Path
+import io
+import tempfile
+import unittest
+
+from batch import (
+    assemble_batch,
+    duplicate_outputs,
+    expand_patterns,
+    main,
+    read_manifest,
+    )
+
+
+class TestBatch(unittest.TestCase):
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.dir = Path(temp_dir.name)
+        Path(self.dir, 'a.vns').write_text('.section 1\nCAP\n')
+        Path(self.dir, 'b.vns').write_text('.section 2\nADD r1, r2\n')
+        Path(self.dir, 'bad.vns').write_text('CAP\n')
+
+    def test_read_manifest(self):
+        manifest = Path(self.dir, 'manifest')
+        manifest.write_text('# bots\na.vns\n\nb.vns out/b.bin\n')
+        self.assertEqual(
+            [(Path(self.dir, 'a.vns'), None),
+             (Path(self.dir, 'b.vns'), Path(self.dir, 'out', 'b.bin'))],
+            read_manifest(manifest))
+
+    def test_main_manifest(self):
+        manifest = Path(self.dir, 'mf', 'manifest')
+        manifest.parent.mkdir()
+        manifest.write_text('../a.vns out/a.bin\n../b.vns\n')
+        status = main(['-m', str(manifest), '--summary',
+                       str(Path(self.dir, 'summary.txt'))])
+        self.assertEqual(0, status)
+        self.assertTrue(Path(self.dir, 'mf', 'out', 'a.bin').exists())
+        self.assertTrue(Path(self.dir, 'b.out').exists())
+
+    def test_duplicate_outputs(self):
+        Path(self.dir, 'x').mkdir()
+        Path(self.dir, 'x', 'a.vns').write_text('.section 1\nCAP\n')
+        out = Path(self.dir, 'out')
+        pairs = [(Path(self.dir, 'a.vns'), Path(out, 'a.out')),
+                 (Path(self.dir, 'b.vns'), Path(out, 'b.out')),
+                 (Path(self.dir, 'x', 'a.vns'), Path(out, '.', 'a.out'))]
+        self.assertEqual([pairs[2] + (pairs[0][0],)],
+                         duplicate_outputs(pairs))
+        errors = io.StringIO()
+        with redirect_stderr(errors):
+            status = main([str(Path(self.dir, 'a.vns')),
+                           str(Path(self.dir, 'x', 'a.vns')), '-o', str(out)])
+        self.assertEqual(1, status)
+        self.assertIn('both written to', errors.getvalue())
+        self.assertFalse(out.exists())
+
+    def test_expand_patterns(self):
+        sources = expand_patterns(
+            [str(Path(self.dir, '?.vns')), str(Path(self.dir, 'a.vns'))])
+        self.assertEqual(['a.vns', 'b.vns'], [path.name for path in sources])
+
+    def test_assemble_batch(self):
+        pairs = [(Path(self.dir, name + '.vns'), Path(self.dir, name))
+                 for name in ['a', 'bad', 'b']]
+        for jobs in [1, 2]:
+            results = assemble_batch(pairs, jobs)
+            self.assertEqual([1, 0, 1], [r.instructions for r in results])
+            self.assertEqual([False, True, False],
+                             [r.error is not None for r in results])
+        self.assertEqual(b'\x01\x00\x00\x00\x00\x00\x00\x60',
+                         Path(self.dir, 'a').read_bytes()[:8])
+
+    def test_main(self):
+        summary = Path(self.dir, 'summary.txt')
+        status = main([str(Path(self.dir, '*.vns')), '-o',
+                       str(Path(self.dir, 'out')), '--summary', str(summary)])
+        self.assertEqual(1, status)
+        self.assertTrue(Path(self.dir, 'out', 'b.out').exists())
+        self.assertIn('3 files, 1 failed', summary.read_text())
@@ -0,0 +1,27 @@
+"""Testing of the benchmark program generator."""
+
+
+import tempfile
+import unittest
+
+from assembler import assemble_file
+from benchmarks.generate import (
+    iter_program_lines,
+    write_program,
+    )
+from lines import SourceFile
+
+
+class TestGenerate(unittest.TestCase):
+
+    def test_deterministic(self):
+        self.assertEqual(list(iter_program_lines(300, seed=4)),
+                         list(iter_program_lines(300, seed=4)))
+        self.assertEqual(300, len(list(iter_program_lines(300))))
+
+    def test_program_assembles(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = write_program(directory, 500)
+            results = assemble_file(SourceFile(path), path.with_suffix('.bin'))
+        self.assertTrue(all(results[id].code for id in range(1, 12)))
+        self.assertTrue(any(result.fixups for result in results))
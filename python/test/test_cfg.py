@@ -2,6 +2,7 @@
 
 
 import itertools
+import pickle
 import unittest
 
 
@@ -82,12 +83,110 @@ class TestNode(unittest.TestCase):
                          repr(cfg.TerminalNode('sym', 'str')))
 
 
+class TestCompactNodes(unittest.TestCase):
+
+    def make_tree(self):
+        compiled = cfg.CompiledActionTable(pair_action_table(), PairSym)
+        return cfg.parse_compiled(
+            compiled, [(PairSym.item, 'a'), (PairSym.item, 'b')])
+
+    def iter_nodes(self, root):
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(getattr(node, 'children', ())))
+
+    def test_no_dict(self):
+        for node in self.iter_nodes(self.make_tree()):
+            self.assertFalse(hasattr(node, '__dict__'))
+            with self.assertRaises(AttributeError):
+                node.extra = None
+
+    def test_pickle(self):
+        root = self.make_tree()
+        copy = pickle.loads(pickle.dumps(root))
+        for original, loaded in zip(self.iter_nodes(root),
+                                    self.iter_nodes(copy)):
+            self.assertIs(type(original), type(loaded))
+            self.assertIs(original.symbol, loaded.symbol)
+            if isinstance(original, cfg.TerminalNode):
+                self.assertEqual(original, loaded)
+            else:
+                self.assertEqual(original.rule, loaded.rule)
+                self.assertEqual(len(original.children),
+                                 len(loaded.children))
+        self.assertEqual(4, len(list(self.iter_nodes(copy))))
+
+
 class TestActionTable(unittest.TestCase):
 
     def test_new_action_table(self):
         self.assertEqual(0, len(cfg.ActionTable()))
 
 
+class PairSym(SymbolEnum):
+    START = ('START', False)
+    PAIR = ('PAIR', False)
+    item = ('item', True)
+    _EOF = ('_EOF', None)
+
+
+def pair_action_table():
+    # START -> PAIR; PAIR -> item item
+    pair_rule = Rule(PairSym.PAIR, (PairSym.item, PairSym.item))
+    start_rule = Rule(PairSym.START, (PairSym.PAIR,))
+    table = cfg.ActionTable()
+    table[0, PairSym.item] = cfg.Action.shift(1)
+    table[0, PairSym.PAIR] = cfg.Action.shift(3)
+    table[0, PairSym.START] = cfg.Action.shift(4)
+    table[1, PairSym.item] = cfg.Action.shift(2)
+    table[2, PairSym._EOF] = cfg.Action.reduce(pair_rule)
+    table[3, PairSym._EOF] = cfg.Action.reduce(start_rule)
+    table[4, PairSym._EOF] = cfg.Action.done()
+    return table
+
+
+class TestCompiledActionTable(unittest.TestCase):
+
+    def test_compile(self):
+        compiled = cfg.CompiledActionTable(pair_action_table(), PairSym)
+        self.assertEqual(5, compiled.num_states)
+        self.assertEqual(4, compiled.width)
+        self.assertEqual(2, len(compiled.rules))
+        self.assertEqual(cfg.ERROR, compiled.actions[2 * 4 + 0])
+        self.assertEqual(cfg.DONE, compiled.actions[4 * 4 + 3])
+
+    def test_parse_compiled_matches_parse(self):
+        table = pair_action_table()
+        compiled = cfg.CompiledActionTable(table, PairSym)
+        tokens = [(PairSym.item, 'a'), (PairSym.item, 'b')]
+        for root in [cfg.parse(PairSym, table, tokens),
+                     cfg.parse_compiled(compiled, tokens)]:
+            self.assertIs(PairSym.START, root.symbol)
+            (pair,) = root.children
+            self.assertEqual(
+                [cfg.TerminalNode(PairSym.item, 'a'),
+                 cfg.TerminalNode(PairSym.item, 'b')],
+                list(pair.children))
+
+    def test_iter_parse_compiled(self):
+        compiled = cfg.CompiledActionTable(pair_action_table(), PairSym)
+        eof = (PairSym._EOF, None)
+        tokens = [eof, (PairSym.item, 'a'), (PairSym.item, 'b'), eof, eof,
+                  (PairSym.item, 'c'), (PairSym.item, 'd')]
+        roots = list(cfg.iter_parse_compiled(compiled, tokens, PairSym._EOF))
+        self.assertEqual(2, len(roots))
+        self.assertEqual(
+            ['c', 'd'],
+            [leaf.text for leaf in roots[1].children[0].children])
+
+    def test_parse_compiled_error(self):
+        compiled = cfg.CompiledActionTable(pair_action_table(), PairSym)
+        with self.assertRaises(KeyError):
+            cfg.parse_compiled(compiled, [(PairSym.item, 'a')])
+
+
 class TestPasingStack(unittest.TestCase):
 
     def test_pasing_stack(self):
@@ -0,0 +1,62 @@
+"""Testing of the Defines symbol table."""
+
+
+import unittest
+
+from defines import (
+    Defines,
+    NUM_OF_UNITS,
+    )
+
+
+class TestDefines(unittest.TestCase):
+
+    def setUp(self):
+        self.defines = Defines()
+
+    def set_in(self, section, key, value):
+        self.defines.current_section = section
+        self.defines[key] = value
+
+    def get_in(self, section, key):
+        self.defines.current_section = section
+        return self.defines.get(key)
+
+    def test_shared_defines(self):
+        self.set_in(0, 'size', 4)
+        for section in range(NUM_OF_UNITS + 1):
+            self.assertEqual(4, self.get_in(section, 'size'))
+        self.set_in(0, 'size', 5)
+        self.assertEqual(5, self.get_in(7, 'size'))
+
+    def test_unit_defines(self):
+        self.set_in(3, 'loop', 10)
+        self.assertEqual(10, self.get_in(3, 'loop'))
+        self.assertIsNone(self.get_in(0, 'loop'))
+        self.assertIsNone(self.get_in(4, 'loop'))
+
+    def test_override(self):
+        self.set_in(2, 'size', 8)
+        self.set_in(0, 'size', 4)
+        self.assertEqual(8, self.get_in(2, 'size'))
+        self.assertEqual(4, self.get_in(1, 'size'))
+        self.defines.current_section = 2
+        del self.defines['size']
+        self.assertEqual(4, self.defines['size'])
+        with self.assertRaises(KeyError):
+            del self.defines['size']
+
+    def test_delete_shared(self):
+        self.set_in(0, 'size', 4)
+        self.set_in(5, 'size', 6)
+        self.defines.current_section = 0
+        del self.defines['size']
+        self.assertNotIn('size', self.defines)
+        self.assertIsNone(self.get_in(1, 'size'))
+        self.assertEqual(6, self.get_in(5, 'size'))
+
+    def test_names_interned(self):
+        name = ''.join(['lo', 'op'])
+        self.set_in(1, name, 0)
+        key, = self.defines.section_defines[1]
+        self.assertIs(key, 'loop')
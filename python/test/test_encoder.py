@@ -0,0 +1,53 @@
+"""Testing of the instruction encoder."""
+
+
+import unittest
+
+from encoder import (
+    EncodingError,
+    SectionEncoder,
+    )
+from grammar import parse_string
+from op_code import ALL_OPERATIONS
+from syntax import to_node
+
+
+def encode(*lines):
+    encoder = SectionEncoder()
+    for line in lines:
+        node = to_node(parse_string(line))
+        encoder.add(ALL_OPERATIONS[node.operation_name], node.args)
+    return encoder
+
+
+class TestSectionEncoder(unittest.TestCase):
+
+    def test_abcs(self):
+        self.assertEqual([(1 << 25) | (1 << 20) | (2 << 15) | (3 << 10) | 4],
+                         list(encode('SUB r1, r2, r3, 4').words()))
+
+    def test_ai(self):
+        self.assertEqual([(15 << 25) | (31 << 20) | 0xFFFFF],
+                         list(encode('JIZ r31, 1048575').words()))
+
+    def test_formats(self):
+        self.assertEqual(
+            [(48 << 25), (64 << 25) | (7 << 20), 4294967295, (1 << 25)],
+            list(encode('CAP', 'WCS r7', 'RAW 4294967295', 'SUB').words()))
+
+    def test_to_bytes(self):
+        self.assertEqual(b'\x04\x0c\x11\x02\x01\x00\x00\x00',
+                         encode('SUB r1, r2, r3, 4', 'RAW 1').to_bytes())
+
+    def test_errors(self):
+        for line in ['ADD r1, r2, r3, 512', 'JIZ r1, 1048576',
+                     'ADD 1', 'ADD r1, r2, r3, r4', 'CAP r1',
+                     'JIZ loop']:
+            with self.assertRaises(EncodingError):
+                encode(line)
+
+    def test_fixups(self):
+        encoder = encode('CAP', 'JIZ r1, loop', 'RAW end')
+        self.assertEqual([(1, 'I', 'loop'), (2, 'L', 'end')], encoder.fixups)
+        self.assertEqual([48 << 25, (15 << 25) | (1 << 20), 0],
+                         list(encoder.words()))
@@ -7,7 +7,11 @@ from cfg import (
     TerminalNode,
     )
 from grammar import (
+    iter_parse_buffer,
+    iter_terminals_from_buffer,
     iter_terminals_from_str,
+    parse_string,
+    VNSRules,
     VNSSymbols,
     )
 
@@ -34,3 +38,85 @@ class TestNode(unittest.TestCase):
     def test_parse_operation_upper(self):
         tokens = list_terminals_from_str('ADD')
         self.assertEqual([(VNSSymbols.Operation, 'ADD')], tokens)
+
+    def test_operation_or_identifier(self):
+        target = [
+            (VNSSymbols.Operation, 'aDd'),
+            (VNSSymbols.Identifier, 'ADDER'),
+            (VNSSymbols.Identifier, 'cap_loop'),
+            (VNSSymbols.Identifier, 'AD'),
+            ]
+        self.assertEqual(
+            target, list_terminals_from_str('aDd ADDER cap_loop AD'))
+
+    def test_iter_terminals_whole_line(self):
+        target = [
+            (VNSSymbols.Operation, 'sub'),
+            (VNSSymbols.Register, 'r31'),
+            (VNSSymbols.Comma, ','),
+            (VNSSymbols.Integer, '10'),
+            (VNSSymbols.Comma, ','),
+            (VNSSymbols.Identifier, 'r32'),
+            ]
+        self.assertEqual(
+            target, list_terminals_from_str('\tsub r31,10 ,  r32  '))
+
+    def test_iter_terminals_from_buffer(self):
+        target = [
+            (VNSSymbols.Operation, 'CAP'),
+            (VNSSymbols.Newline, '\n'),
+            (VNSSymbols.Newline, '\n'),
+            (VNSSymbols.Operation, 'LIN'),
+            ]
+        self.assertEqual(target, list(iter_terminals_from_buffer(
+            b'CAP ; Comment, with @ symbols\n\t; Whole line\nLIN')))
+
+    def test_shared_text(self):
+        first = list(iter_terminals_from_buffer(b'add r1, lab, 12345'))
+        second = list(iter_terminals_from_buffer(bytearray(
+            b'add r1, lab, 12345')))
+        # add r1 , lab , 12345: only lab and 12345 are not shared.
+        for index, ((_, left), (_, right)) in enumerate(zip(first, second)):
+            if index in (3, 5):
+                self.assertEqual(left, right)
+                self.assertIsNot(left, right)
+            else:
+                self.assertIs(left, right)
+        self.assertIs(first[0][1], list_terminals_from_str('add')[0][1])
+
+    def test_iter_terminals_empty(self):
+        self.assertEqual([], list_terminals_from_str(' \t '))
+
+
+class TestParseString(unittest.TestCase):
+
+    def test_parse_no_args(self):
+        root = parse_string('CAP')
+        self.assertIs(VNSRules.LINE, root.rule)
+        self.assertIs(VNSRules.NO_ARG, root.children[1].rule)
+
+    def test_parse_args(self):
+        root = parse_string('ADD r1, r2, 5')
+        args = root.children[1]
+        self.assertIs(VNSRules.MULTI_ARG, args.rule)
+        self.assertIs(VNSRules.MORE_ARGS, args.children[1].rule)
+        self.assertIs(VNSRules.LAST_ARG, args.children[1].children[2].rule)
+
+    def test_parse_error(self):
+        with self.assertRaises(KeyError):
+            parse_string('ADD r1 r2')
+
+
+class TestIterParseBuffer(unittest.TestCase):
+
+    def test_iter_parse_buffer(self):
+        text = b'ADD r1, r2 ; first\n\n  ; comment\nCAP\nJIZ r3, loop\n'
+        roots = list(iter_parse_buffer(text))
+        self.assertEqual(3, len(roots))
+        self.assertEqual(
+            ['ADD', 'CAP', 'JIZ'],
+            [root.children[0].children[0].text for root in roots])
+
+    def test_iter_parse_buffer_error(self):
+        with self.assertRaises(KeyError):
+            list(iter_parse_buffer(b'CAP\nADD r1 r2\n'))
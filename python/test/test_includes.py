@@ -0,0 +1,99 @@
+"""Testing of the include manager."""
+
+
+import os
+from pathlib import Path
+import tempfile
+import unittest
+
+from assembler import (
+    assemble_sections,
+    AssemblyError,
+    prescan,
+    )
+from includes import (
+    IncludeError,
+    IncludeManager,
+    )
+from lines import SourceBuffer
+
+
+class TestIncludes(unittest.TestCase):
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.dir = Path(temp_dir.name).resolve()
+        self.includes = IncludeManager()
+
+    def write(self, name, text):
+        path = Path(self.dir, name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+        return path
+
+    def prescan(self, path):
+        with SourceBuffer(path) as buffer:
+            return prescan(buffer, self.includes)
+
+    def test_splice(self):
+        header = self.write('lib/header.vns', 'CAP ; shared\n')
+        first = self.write('first.vns',
+                           '.section 1\n.include "lib/header.vns"\nLIN\n')
+        second = self.write('second.vns',
+                            '.section 2\n.include lib/header.vns\n')
+        sections = self.prescan(first)
+        self.assertEqual([b'CAP', b'LIN'], sections[1].lines)
+        sections = self.prescan(second)
+        self.assertEqual([b'CAP'], sections[2].lines)
+        self.assertEqual((1, 1), (self.includes.hits, self.includes.misses))
+        self.assertEqual({header}, self.includes.dependencies(first))
+
+    def test_rescan_changed(self):
+        header = self.write('header.vns', 'CAP\n')
+        main = self.write('main.vns', '.section 1\n.include header.vns\n')
+        self.prescan(main)
+        snapshot = self.includes.snapshot(main)
+        self.assertFalse(self.includes.needs_rebuild(snapshot))
+        header.write_text('CAP\nLIN\n')
+        stat = os.stat(str(header))
+        os.utime(str(header), ns=(stat.st_atime_ns,
+                                  stat.st_mtime_ns + 10 ** 9))
+        self.assertTrue(self.includes.needs_rebuild(snapshot))
+        self.assertEqual([b'CAP', b'LIN'], self.prescan(main)[1].lines)
+        self.assertEqual(2, self.includes.misses)
+
+    def test_nested_and_sections(self):
+        self.write('inner.vns', '.section 3\nJIZ r1, 0\n')
+        self.write('outer.vns', '.include inner.vns\nLIN\n')
+        main = self.write('main.vns', '.section 1\n.include outer.vns\nCAP\n')
+        sections = self.prescan(main)
+        self.assertEqual([], sections[1].lines)
+        self.assertEqual([b'JIZ r1, 0', b'LIN', b'CAP'], sections[3].lines)
+        self.assertEqual(3, len(assemble_sections(sections)[3].listing))
+
+    def test_error_names_included_file(self):
+        header = self.write('header.vns', 'CAP\n\nADD r1 r2\n')
+        main = self.write('main.vns', '.section 1\n.include header.vns\nLIN\n')
+        sections = self.prescan(main)
+        self.assertEqual([str(header), str(header), str(main)],
+                         sections[1].paths)
+        self.assertEqual((str(main), 3), sections[1].location(2))
+        with self.assertRaises(AssemblyError) as context:
+            assemble_sections(sections)
+        self.assertEqual((str(header), 3), context.exception.args[-2:])
+
+    def test_cycle(self):
+        self.write('a.vns', '.include b.vns\n')
+        self.write('b.vns', '.include a.vns\n')
+        main = self.write('main.vns', '.include a.vns\n')
+        with self.assertRaises(IncludeError):
+            self.prescan(main)
+        self_include = self.write('self.vns', '.include self.vns\n')
+        with self.assertRaises(IncludeError):
+            self.prescan(self_include)
+
+    def test_missing(self):
+        main = self.write('main.vns', '.include nowhere.vns\n')
+        with self.assertRaises(IncludeError):
+            self.prescan(main)
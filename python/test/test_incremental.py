@@ -0,0 +1,74 @@
+"""Testing of the incremental section cache."""
+
+
+from pathlib import Path
+import tempfile
+import unittest
+
+from assembler import (
+    assemble_sections,
+    prescan,
+    )
+from incremental import (
+    section_key,
+    SectionCache,
+    )
+from lines import SourceBuffer
+
+
+SOURCE_TEXT = '''\
+.section 1
+ADD r1, r2 ; add
+loop: JIZ r1, loop
+.section 2
+CAP
+JIZ r2, 3
+'''
+
+
+class TestSectionCache(unittest.TestCase):
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.cache_path = Path(temp_dir.name, 'cache', 'source.sections')
+        self.source_path = Path(temp_dir.name, 'source.vns')
+
+    def prescan_text(self, text):
+        self.source_path.write_text(text)
+        with SourceBuffer(self.source_path) as buffer:
+            return prescan(buffer)
+
+    def run_cache(self, text, jobs=1):
+        sections = self.prescan_text(text)
+        cache = SectionCache.load(self.cache_path)
+        results = assemble_sections(sections, jobs, cache)
+        cache.save()
+        return cache, results
+
+    def test_section_key(self):
+        first, second = self.prescan_text(SOURCE_TEXT)[1:3]
+        self.assertNotEqual(section_key(first), section_key(second))
+        edited = self.prescan_text(SOURCE_TEXT.replace('; add', '\n'))[1]
+        self.assertEqual(section_key(first), section_key(edited))
+
+    def test_reassemble_changed_sections(self):
+        cache, results = self.run_cache(SOURCE_TEXT)
+        self.assertEqual((0, 12), (cache.hits, cache.misses))
+        expected = [result.code for result in results]
+        cache, results = self.run_cache(SOURCE_TEXT)
+        self.assertEqual((12, 0), (cache.hits, cache.misses))
+        self.assertEqual(expected, [result.code for result in results])
+        cache, results = self.run_cache(
+            SOURCE_TEXT.replace('CAP', 'LIN'), jobs=2)
+        self.assertEqual((11, 1), (cache.hits, cache.misses))
+        self.assertEqual(['LIN', 'JIZ r2, 3'], results[2].listing)
+        self.assertEqual(expected[1], results[1].code)
+
+    def test_labels_resolved_again(self):
+        self.run_cache(SOURCE_TEXT)
+        cache, results = self.run_cache(SOURCE_TEXT)
+        self.assertEqual(12, cache.hits)
+        self.assertEqual(1, results[1].labels['loop'])
+        word = int.from_bytes(results[1].code[4:8], 'little')
+        self.assertEqual(1, word & 0xfffff)
@@ -0,0 +1,98 @@
+"""Testing of the phase instrumentation."""
+
+
+import io
+import json
+from pathlib import Path
+import tempfile
+import tracemalloc
+import unittest
+
+import instrument
+from recruiter import main
+
+
+GOLDEN_SOURCE = Path(__file__).parent / 'golden' / 'sample.vns'
+
+
+class TestInstrument(unittest.TestCase):
+
+    def tearDown(self):
+        instrument.stop()
+
+    def test_disabled(self):
+        self.assertFalse(instrument.enabled())
+        with instrument.phase('nothing'):
+            pass
+        self.assertIsNone(instrument.stop())
+
+    def test_phases(self):
+        recorder = instrument.start()
+        with instrument.source_file('a.vns'):
+            for _ in range(3):
+                with instrument.phase('parse'):
+                    pass
+            with instrument.phase('scan', 'b.vns'):
+                pass
+        with instrument.phase('write'):
+            pass
+        self.assertIs(recorder, instrument.stop())
+        self.assertEqual(3, recorder.stats[('a.vns', 'parse')].calls)
+        self.assertEqual(1, recorder.stats[('b.vns', 'scan')].calls)
+        self.assertEqual(1, recorder.stats[(None, 'write')].calls)
+
+    def test_trace_memory(self):
+        recorder = instrument.start(trace_memory=True)
+        with instrument.phase('allocate'):
+            kept = bytearray(100000)
+        instrument.stop()
+        stats = recorder.stats[(None, 'allocate')]
+        self.assertLessEqual(100000, stats.allocated)
+        self.assertLessEqual(100000, stats.peak)
+        text = io.StringIO()
+        recorder.write_text(text)
+        self.assertIn('allocate', text.getvalue())
+
+    def test_trace_memory_without_reset_peak(self):
+        self.addCleanup(setattr, instrument, '_CAN_RESET_PEAK',
+                        instrument._CAN_RESET_PEAK)
+        instrument._CAN_RESET_PEAK = False
+        recorder = instrument.start(trace_memory=True)
+        with instrument.phase('allocate'):
+            kept = bytearray(100000)
+        del kept
+        with instrument.phase('small'):
+            kept = bytearray(1000)
+        instrument.stop()
+        self.assertLessEqual(100000, recorder.stats[(None, 'allocate')].peak)
+        small = recorder.stats[(None, 'small')]
+        self.assertLessEqual(1000, small.peak)
+        self.assertLess(small.peak, 100000)
+
+    def test_null_phase(self):
+        with instrument.phase('nothing') as stats:
+            self.assertIsNone(stats)
+
+    def test_outer_tracing_kept(self):
+        tracemalloc.start()
+        self.addCleanup(tracemalloc.stop)
+        instrument.start(trace_memory=True)
+        instrument.stop()
+        self.assertTrue(tracemalloc.is_tracing())
+        tracemalloc.stop()
+        instrument.start(trace_memory=True)
+        self.assertTrue(tracemalloc.is_tracing())
+        instrument.stop()
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_recruiter_timings(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            timings = Path(temp_dir, 'timings.json')
+            main([str(GOLDEN_SOURCE), str(Path(temp_dir, 'out')),
+                  '--timings', 'json', '--timings-file', str(timings)])
+            data = json.loads(timings.read_text())
+        phases = data['files'][str(GOLDEN_SOURCE.resolve())]
+        self.assertEqual(
+            {'prescan', 'parse', 'syntax', 'encode', 'resolve', 'write'},
+            set(phases))
+        self.assertEqual({'calls', 'seconds'}, set(phases['parse']))
@@ -0,0 +1,52 @@
+"""Testing of label resolution."""
+
+
+import unittest
+
+from assembler import (
+    assemble_sections,
+    AssemblyError,
+    Section,
+    )
+from labels import ResolutionError
+
+
+def make_section(id, *lines):
+    section = Section(id)
+    for number, line in enumerate(lines, 1):
+        section.add_line(number, line.encode())
+    return section
+
+
+def words(result):
+    return [int.from_bytes(result.code[i:i + 4], 'little')
+            for i in range(0, len(result.code), 4)]
+
+
+class TestLabels(unittest.TestCase):
+
+    def test_forward_and_backward(self):
+        results = assemble_sections([make_section(
+            1, 'start: CAP', 'JIZ r1, end', 'loop:', 'JNZ r2, loop',
+            'end: RAW start')])
+        self.assertEqual({'start': 0, 'loop': 2, 'end': 3},
+                         results[0].labels)
+        self.assertEqual(
+            [48 << 25, (15 << 25) | (1 << 20) | 3,
+             (16 << 25) | (2 << 20) | 2, 0],
+            words(results[0]))
+        self.assertEqual('loop:', results[0].listing[2])
+
+    def test_sections_are_separate(self):
+        with self.assertRaises(ResolutionError):
+            assemble_sections([make_section(1, 'here: CAP'),
+                               make_section(2, 'JIZ r1, here')])
+        results = assemble_sections([make_section(1, 'here: CAP'),
+                                     make_section(2, 'here: JIZ r1, here')])
+        self.assertEqual((15 << 25) | (1 << 20), words(results[1])[0])
+
+    def test_label_errors(self):
+        with self.assertRaises(AssemblyError):
+            assemble_sections([make_section(1, 'a: CAP', 'a: LIN')])
+        with self.assertRaises(ResolutionError):
+            assemble_sections([make_section(1, 'JIZ r1, missing')])
@@ -0,0 +1,91 @@
+"""Testing of the lalr1 ActionTable generator."""
+
+
+import unittest
+
+
+from cfg import (
+    parse,
+    Rule,
+    RuleListing,
+    SymbolEnum,
+    )
+import lalr1
+import slr1
+
+
+class AssignSym(SymbolEnum):
+    S = ('S', False)
+    L = ('L', False)
+    R = ('R', False)
+    equals = ('equals', True)
+    star = ('star', True)
+    id = ('id', True)
+    _EOF = ('_EOF', None)
+
+
+class AssignRules(RuleListing, symbol_type=AssignSym):
+    """The classic grammar that is LALR(1) but not SLR(1)."""
+    ASSIGN = 'S', ['L', 'equals', 'R']
+    VALUE = 'S', ['R']
+    DEREF = 'L', ['star', 'R']
+    NAME = 'L', ['id']
+    LOAD = 'R', ['L']
+
+
+class TestDigraph(unittest.TestCase):
+
+    def test_chain(self):
+        result = lalr1.digraph([[1], [2], []], [{'a'}, {'b'}, {'c'}])
+        self.assertEqual([{'a', 'b', 'c'}, {'b', 'c'}, {'c'}], result)
+
+    def test_cycle(self):
+        result = lalr1.digraph([[1], [0, 2], []], [{'a'}, {'b'}, {'c'}])
+        self.assertEqual([{'a', 'b', 'c'}, {'a', 'b', 'c'}, {'c'}], result)
+        self.assertIs(result[0], result[1])
+
+
+class TestLalr1(unittest.TestCase):
+
+    def test_slr1_conflict(self):
+        with self.assertRaisesRegex(Exception, 'Conflict'):
+            slr1.generate_action_table(AssignSym, AssignSym.S, AssignRules)
+
+    def test_parse(self):
+        table = lalr1.generate_action_table(
+            AssignSym, AssignSym.S, AssignRules)
+        tokens = [(AssignSym.star, '*'), (AssignSym.id, 'x'),
+                  (AssignSym.equals, '='), (AssignSym.id, 'y')]
+        root = parse(AssignSym, table, tokens)
+        self.assertIs(AssignRules.ASSIGN, root.rule)
+
+    def test_nullable_lookahead(self):
+        class Sym(SymbolEnum):
+            S = ('S', False)
+            A = ('A', False)
+            B = ('B', False)
+            a = ('a', True)
+            b = ('b', True)
+            EOF = ('EOF', None)
+
+        # S -> A B b; A -> a; B -> | a
+        rules = [
+            Rule(Sym.S, (Sym.A, Sym.B, Sym.b)),
+            Rule(Sym.A, (Sym.a,)),
+            Rule(Sym.B, ()),
+            Rule(Sym.B, (Sym.a,)),
+            ]
+        table = lalr1.generate_action_table(Sym, Sym.S, rules)
+        reduce_a = [key for key, action in table.items()
+                    if action.kind == 'reduce' and action.data == rules[1]]
+        self.assertEqual({Sym.a, Sym.b}, {symbol for _, symbol in reduce_a})
+        root = parse(Sym, table, [(Sym.a, '1'), (Sym.b, '2')])
+        self.assertIs(rules[0], root.rule)
+
+    def test_matches_slr1(self):
+        from grammar import VNSRules, VNSSymbols
+        slr1_table = slr1.generate_action_table(
+            VNSSymbols, VNSSymbols.START, VNSRules)
+        lalr1_table = lalr1.generate_action_table(
+            VNSSymbols, VNSSymbols.START, VNSRules)
+        self.assertEqual(dict(slr1_table.items()), dict(lalr1_table.items()))
@@ -0,0 +1,43 @@
+"""Tests for the lines.py file."""
+
+
+from pathlib import Path
+import tempfile
+import unittest
+
+from lines import (
+    SourceBuffer,
+    SourceFile,
+    )
+
+
+SOURCE_TEXT = 'ADD r1, r2 ; add\n\n; comment only\nCAP\r\nJIZ r3, loop'
+
+
+class TestSourceFile(unittest.TestCase):
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.path = Path(temp_dir.name, 'source.vns')
+        self.path.write_bytes(SOURCE_TEXT.encode())
+
+    def test_physical_spans(self):
+        with SourceBuffer(self.path) as buffer:
+            spans = list(buffer.iter_physical())
+            self.assertEqual([1, 2, 3, 4, 5],
+                             [span.line_number for span in spans])
+            self.assertEqual('JIZ r3, loop', spans[4].text)
+
+    def test_code_end(self):
+        with SourceBuffer(self.path) as buffer:
+            spans = list(buffer.iter_physical())
+            self.assertEqual(b'ADD r1, r2 ',
+                             buffer.data[spans[0].start:spans[0].code_end()])
+            self.assertEqual(spans[2].start, spans[2].code_end())
+            self.assertEqual(spans[3].end, spans[3].code_end())
+
+    def test_empty_file(self):
+        self.path.write_bytes(b'')
+        with SourceFile(self.path).open_buffer() as buffer:
+            self.assertEqual([], list(buffer.iter_physical()))
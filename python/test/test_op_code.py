@@ -0,0 +1,73 @@
+"""Testing of the operation tables."""
+
+
+import unittest
+
+from op_code import (
+    ALL_OPERATIONS,
+    allowed_in_section,
+    compile_format,
+    iter_section_operations,
+    OPERATION_INDEX,
+    SECTION_OPS,
+    )
+
+
+class TestFormatDescriptor(unittest.TestCase):
+
+    def test_compile_format(self):
+        descriptor = compile_format('ABCS')
+        self.assertEqual(4, descriptor.arity)
+        self.assertEqual(0b1111, descriptor.required_mask)
+        self.assertEqual('ABCS', ''.join(
+            field.letter for field in descriptor.fields))
+        small = descriptor.fields[3]
+        self.assertEqual((0, 10, True, False), (
+            small.shift, small.width, small.signed, small.register))
+        self.assertEqual((-512, 511, 0x3FF),
+                         (small.low, small.high, small.mask))
+        self.assertTrue(descriptor.fields[0].register)
+
+    def test_optional_arguments(self):
+        descriptor = compile_format('Ai')
+        self.assertEqual(2, descriptor.arity)
+        self.assertEqual(0b01, descriptor.required_mask)
+        self.assertEqual('I', descriptor.fields[1].letter)
+
+    def test_shared(self):
+        self.assertIs(compile_format('AI'), ALL_OPERATIONS['JIZ'].descriptor)
+        self.assertIs(ALL_OPERATIONS['SAY'].descriptor,
+                      ALL_OPERATIONS['JIZ'].descriptor)
+        self.assertEqual('AI', ALL_OPERATIONS['JIZ'].format)
+
+
+class TestOperationIndex(unittest.TestCase):
+
+    def test_case_folding(self):
+        for name in ['jiz', 'JIZ', 'jIz', 'Jiz']:
+            self.assertIs(ALL_OPERATIONS['JIZ'], OPERATION_INDEX[name])
+        self.assertNotIn('JIZZ', OPERATION_INDEX)
+        self.assertEqual(8 * len(ALL_OPERATIONS), len(OPERATION_INDEX))
+
+
+class TestSectionOps(unittest.TestCase):
+
+    def test_bitmaps(self):
+        for section in range(1, 12):
+            self.assertTrue(
+                allowed_in_section(ALL_OPERATIONS['ADD'], section))
+            self.assertTrue(
+                allowed_in_section(ALL_OPERATIONS['RAW'], section))
+            self.assertLess(SECTION_OPS[section], 1 << 128)
+        self.assertFalse(allowed_in_section(ALL_OPERATIONS['ADD'], 0))
+        self.assertIs(SECTION_OPS[4], SECTION_OPS[5])
+
+    def test_indexes_unique(self):
+        indexes = [op_data.index for op_data in ALL_OPERATIONS.values()]
+        self.assertEqual(len(indexes), len(set(indexes)))
+        self.assertEqual(127, ALL_OPERATIONS['RAW'].index)
+
+    def test_iter_section_operations(self):
+        names = {op_data.name for op_data in iter_section_operations(1)}
+        self.assertEqual(set(ALL_OPERATIONS), names)
+        self.assertEqual([], list(iter_section_operations(0)))
@@ -3,10 +3,6 @@
 
 from collections import defaultdict
 import unittest
-from unittest.mock import (
-    call,
-    patch,
-    )
 
 
 from cfg import (
@@ -18,14 +14,17 @@ from cfg import (
 from slr1 import (
     add_reduce_operations,
     add_shift_and_done_operations,
+    ClosureIndex,
     generate_action_table,
     fill_kernal_label,
     fill_state_graph,
     fill_terminals_first_set,
+    group_by_next_symbol,
     insert_starting_state,
     Item,
     Label,
     make_imaginary_rule,
+    make_symbol_data,
     rule_first_set,
     rule_follow_set,
     shift_all,
@@ -137,11 +136,38 @@ class TestMakeSymbolData(unittest.TestCase):
             rule_follow_set(rule, symbol_data))
 
 
+    def test_make_symbol_data(self):
+        class Sym(SymbolEnum):
+            S = ('S', False)
+            L = ('L', False)
+            E = ('E', False)
+            x = ('x', True)
+            comma = ('comma', True)
+            EOF = ('EOF', None)
+
+        # S -> L E; L -> L comma x | x; E -> | comma
+        rules = [
+            Rule(Sym.S, (Sym.L, Sym.E)),
+            Rule(Sym.L, (Sym.L, Sym.comma, Sym.x)),
+            Rule(Sym.L, (Sym.x,)),
+            Rule(Sym.E, ()),
+            Rule(Sym.E, (Sym.comma,)),
+            ]
+        data = make_symbol_data(Sym, Sym.S, rules)
+        self.assertEqual([False, False, True],
+                         [data[s].nullable for s in (Sym.S, Sym.L, Sym.E)])
+        self.assertEqual({Sym.x}, data[Sym.S].first_set)
+        self.assertEqual({Sym.comma}, data[Sym.E].first_set)
+        self.assertEqual({Sym.EOF}, data[Sym.S].follow_set)
+        self.assertEqual({Sym.comma, Sym.EOF}, data[Sym.L].follow_set)
+        self.assertEqual({Sym.EOF}, data[Sym.E].follow_set)
+
+
 class TestStateGraph(unittest.TestCase):
 
     def small_state_graph(self, label=Label('a')):
         graph = StateGraph()
-        graph._states.append((label, {}))
+        graph.add_state(label)
         return graph
 
     def test_lookup(self):
@@ -153,6 +179,13 @@ class TestStateGraph(unittest.TestCase):
         with self.assertRaises(KeyError):
             graph.lookup(Label('b'))
 
+    def test_default_lookup(self):
+        graph = self.small_state_graph()
+        self.assertEqual(0, graph.default_lookup(Label('a')))
+        self.assertEqual(1, graph.default_lookup(Label('b')))
+        self.assertEqual(1, graph.lookup(Label('b')))
+        self.assertEqual(Label('b'), graph.label_of(1))
+
 
 class TestMakeStateGraph(unittest.TestCase):
 
@@ -182,22 +215,29 @@ class TestMakeStateGraph(unittest.TestCase):
         Rules = (Rule(Sym.START, (Sym.MIDDLE, Sym.MIDDLE)),)
 
         graph = StateGraph()
-        with patch.object(graph, 'iter_state_ids', return_value=range(3)):
-            with patch('slr1.build_transition') as mock_bt:
-                fill_state_graph(graph, Sym, Rules)
-        self.assertEqual(9, mock_bt.call_count)
+        imaginary_rule = make_imaginary_rule(Sym, Sym.START)
+        insert_starting_state(graph, imaginary_rule, Rules)
+        fill_state_graph(graph, Sym, Rules)
         self.assertEqual(
-            mock_bt.call_args_list, [
-                call(graph, Rules, 0, Sym.START),
-                call(graph, Rules, 0, Sym.MIDDLE),
-                call(graph, Rules, 0, Sym.END),
-                call(graph, Rules, 1, Sym.START),
-                call(graph, Rules, 1, Sym.MIDDLE),
-                call(graph, Rules, 1, Sym.END),
-                call(graph, Rules, 2, Sym.START),
-                call(graph, Rules, 2, Sym.MIDDLE),
-                call(graph, Rules, 2, Sym.END),
-                ])
+            [{Sym.START: 1, Sym.MIDDLE: 2}, {Sym.END: 3}, {Sym.MIDDLE: 4},
+             {}, {}],
+            [transitions for _, _, transitions in graph.iter_states()])
+        self.assertEqual(
+            Label.from_rule(Rules[0], 2), graph.label_of(4))
+
+    def test_group_by_next_symbol(self):
+        Sym = self.Sym1
+        items = (
+            Item(Rule(Sym.HEAD, (Sym.A,)), 1),
+            Item(Rule(Sym.HEAD, (Sym.A, Sym.B)), 1),
+            Item(Rule(Sym.HEAD, (Sym.A, Sym.A)), 1),
+            Item(Rule(Sym.HEAD, (Sym.B, Sym.A)), 1),
+            )
+        groups = group_by_next_symbol(Label(items))
+        self.assertEqual({Sym.A, Sym.B}, set(groups))
+        self.assertEqual({items[1].next_item()}, set(groups[Sym.B]))
+        self.assertEqual(
+            {items[2].next_item(), items[3].next_item()}, set(groups[Sym.A]))
 
     class Sym1(SymbolEnum):
         HEAD = ('HEAD', False)
@@ -269,6 +309,20 @@ class TestMakeStateGraph(unittest.TestCase):
         self.assertEqual(
             Label(expect_item), fill_kernal_label(rules, Label(items)))
 
+    def test_closure_index(self):
+        Sym = self.Sym1
+        rules = (
+            Rule(Sym.A, (Sym.A, Sym.B)),
+            Rule(Sym.A, (Sym.X,)),
+            Rule(Sym.X, (Sym.x,)),
+            Rule(Sym.B, (Sym.y,)),
+            )
+        closures = ClosureIndex(rules)
+        expect = frozenset([Item(rules[0]), Item(rules[1]), Item(rules[2])])
+        self.assertEqual(expect, closures.closure_of(Sym.A))
+        self.assertIs(closures.closure_of(Sym.A), closures.closure_of(Sym.A))
+        self.assertEqual(frozenset(), closures.closure_of(Sym.Y))
+
 
 class TestMakeActionTable(unittest.TestCase):
 
@@ -0,0 +1,56 @@
+"""Testing of the syntax nodes."""
+
+
+import unittest
+
+from grammar import parse_string
+from syntax import (
+    IntegerNode,
+    LabelNode,
+    OperationABCSNode,
+    OperationAINode,
+    RegisterNode,
+    to_node,
+    )
+
+
+def node_from(line):
+    return to_node(parse_string(line))
+
+
+class TestSyntaxNodes(unittest.TestCase):
+
+    def test_operation(self):
+        node = node_from('loop: add r1, r2, r3, 4')
+        self.assertIsInstance(node, OperationABCSNode)
+        self.assertEqual(('loop', 'add', 'ADD'),
+                         (node.label, node.operation, node.operation_name))
+        self.assertEqual('loop: add r1, r2, r3, 4', str(node))
+
+    def test_args_are_lazy(self):
+        node = node_from('JIZ r1, 7')
+        self.assertFalse(hasattr(node, '_args'))
+        self.assertIsInstance(node, OperationAINode)
+        self.assertIsInstance(node.immediate, IntegerNode)
+        self.assertIs(node.args, node.args)
+        self.assertIsInstance(node.register_a, RegisterNode)
+
+    def test_missing_arguments(self):
+        node = node_from('SUB r1')
+        self.assertEqual(1, node.register_a.number)
+        self.assertIsInstance(node.register_b, RegisterNode)
+        self.assertEqual(0, node.register_b.number)
+        self.assertIsInstance(node.small_immediate, IntegerNode)
+        self.assertEqual(0, int(node.small_immediate))
+        self.assertEqual(0, int(node_from('JIZ r1').immediate))
+        self.assertEqual('SUB r1', str(node))
+
+    def test_label_line(self):
+        node = node_from('end:')
+        self.assertIsInstance(node, LabelNode)
+        self.assertEqual('end:', str(node))
+
+    def test_long_argument_list(self):
+        # The ARG_TAIL chain is followed without recursing.
+        node = node_from('RAW ' + ', '.join(['1'] * 5000))
+        self.assertEqual(5000, len(node.args))
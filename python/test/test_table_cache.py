@@ -0,0 +1,106 @@
+"""Testing of the persistent action table cache."""
+
+
+from pathlib import Path
+import tempfile
+import unittest
+
+
+from cfg import (
+    CompiledActionTable,
+    Rule,
+    SymbolEnum,
+    )
+from lalr1 import (
+    generate_action_table as generate_lalr1_table,
+    )
+from slr1 import (
+    generate_action_table,
+    )
+import table_cache
+from table_cache import (
+    grammar_key,
+    load_compiled_table,
+    )
+
+
+class CacheSym(SymbolEnum):
+    START = ('START', False)
+    word = ('word', True)
+    _EOF = ('_EOF', None)
+
+
+CACHE_RULES = (
+    Rule(CacheSym.START, (CacheSym.word,)),
+    )
+
+
+generated = []
+
+
+def counting_generator(symbols, starting_symbol, rules):
+    generated.append(rules)
+    return generate_action_table(symbols, starting_symbol, rules)
+
+
+class TestTableCache(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.cache_dir = self.temp_dir.name
+        generated.clear()
+
+    def load(self, rules=CACHE_RULES, **kwargs):
+        return load_compiled_table(
+            'test', CacheSym, CacheSym.START, rules,
+            counting_generator, cache_dir=self.cache_dir, **kwargs)
+
+    def test_grammar_key_changes(self):
+        key = grammar_key(
+            CacheSym, CacheSym.START, CACHE_RULES, generate_action_table)
+        other_rules = CACHE_RULES + (Rule(CacheSym.START, ()),)
+        self.assertNotEqual(key, grammar_key(
+            CacheSym, CacheSym.START, other_rules, generate_action_table))
+
+    def test_grammar_key_hashes_source(self):
+        key = grammar_key(
+            CacheSym, CacheSym.START, CACHE_RULES, generate_action_table)
+        self.assertNotEqual(key, grammar_key(
+            CacheSym, CacheSym.START, CACHE_RULES, generate_lalr1_table))
+        sources = []
+        original = table_cache._module_source
+        def changed_source(name):
+            source = original(name)
+            sources.append(name)
+            return source + b'#' if name == 'slr1' else source
+        table_cache._module_source = changed_source
+        self.addCleanup(setattr, table_cache, '_module_source', original)
+        self.assertNotEqual(key, grammar_key(
+            CacheSym, CacheSym.START, CACHE_RULES, generate_action_table))
+        self.assertIn('cfg', sources)
+
+    def test_cache_hit(self):
+        first = self.load()
+        self.assertIsInstance(first, CompiledActionTable)
+        self.assertTrue(Path(self.cache_dir, 'test.table').exists())
+        second = self.load()
+        self.assertEqual(1, len(generated))
+        self.assertEqual(first.actions, second.actions)
+
+    def test_cache_miss_on_changed_rules(self):
+        self.load()
+        other_rules = CACHE_RULES + (Rule(CacheSym.START, ()),)
+        self.load(other_rules)
+        self.assertEqual([CACHE_RULES, other_rules], generated)
+
+    def test_regenerate(self):
+        self.load()
+        self.load(regenerate=True)
+        self.assertEqual(2, len(generated))
+
+    def test_corrupt_cache(self):
+        Path(self.cache_dir, 'test.table').write_bytes(b'not a pickle')
+        table = self.load()
+        self.assertIsInstance(table, CompiledActionTable)
+        self.assertEqual(1, len(generated))
@@ -0,0 +1,108 @@
+"""Testing of the executable image writer."""
+
+
+import io
+import os
+from pathlib import Path
+import struct
+import sys
+import tempfile
+import unittest
+
+from assembler import (
+    assemble_file,
+    SectionResult,
+    )
+from lines import SourceFile
+from writer import (
+    as_arguments,
+    image_bytes,
+    verify_with_as,
+    VerificationError,
+    write_image,
+    )
+
+
+GOLDEN_DIR = Path(__file__).parent / 'golden'
+
+
+def word(op_code, *fields):
+    """Encode an instruction by hand, fields are (value, shift) pairs."""
+    value = op_code << 25
+    for field, shift in fields:
+        value |= field << shift
+    return value
+
+
+# The words of golden/sample.bin, encoded from the formats in _op_code.py.
+SAMPLE_SECTIONS = {
+    1: [word(0, (1, 20), (2, 15), (3, 10), (4, 0)),  # ADD r1, r2, r3, 4
+        word(15, (3, 20), (1000, 0)),                # JIZ r3, 1000
+        word(64, (7, 20)),                           # WCS r7
+        word(48),                                    # CAP
+        305419896],                                  # RAW 305419896
+    4: [word(1, (31, 20), (0, 15))],                 # sub r31, r0
+    11: [word(94)],                                  # DLY
+    }
+
+
+class TestWriter(unittest.TestCase):
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.dir = Path(temp_dir.name)
+
+    def test_write_image(self):
+        results = [SectionResult(2, ['RAW 1'], b'\x01\x00\x00\x00')]
+        file = io.BytesIO()
+        write_image(results, file)
+        image = file.getvalue()
+        self.assertEqual(image, image_bytes(results))
+        self.assertEqual(4 * 12, len(image))
+        self.assertEqual(b'\x01\x00\x00\x00' * 2, image[4:12])
+
+    def test_golden_images(self):
+        sources = sorted(GOLDEN_DIR.glob('*.vns'))
+        self.assertTrue(sources)
+        for source in sources:
+            output = Path(self.dir, source.stem + '.bin')
+            assemble_file(SourceFile(source), output)
+            with self.subTest(source=source.name):
+                self.assertEqual(source.with_suffix('.bin').read_bytes(),
+                                 output.read_bytes())
+
+    def test_golden_sample_layout(self):
+        expected = bytearray()
+        for id in range(1, 12):
+            words = SAMPLE_SECTIONS.get(id, [])
+            expected += struct.pack('<{}I'.format(len(words) + 1),
+                                    len(words), *words)
+        self.assertEqual(bytes(expected),
+                         Path(GOLDEN_DIR, 'sample.bin').read_bytes())
+
+    def test_as_arguments(self):
+        self.assertEqual(['as', 'in.vns', 'out'],
+                         as_arguments('as', 'in.vns', 'out'))
+        self.assertEqual(['/opt/vns as', 'in.vns', 'out'],
+                         as_arguments('/opt/vns as', 'in.vns', 'out'))
+        self.assertEqual(['as', '-o', 'out', 'in.vns'],
+                         as_arguments('as -o {output} {source}',
+                                      'in.vns', 'out'))
+
+    def make_fake_as(self, image):
+        """Make a program that acts like as, always writing image."""
+        image_path = Path(self.dir, 'image')
+        image_path.write_bytes(image)
+        path = Path(self.dir, 'fake_as')
+        path.write_text(
+            '#!{}\nimport shutil, sys\nshutil.copy({!r}, sys.argv[2])\n'
+            .format(sys.executable, str(image_path)))
+        os.chmod(str(path), 0o755)
+        return str(path)
+
+    def test_verify_with_as(self):
+        verify_with_as('CAP\n', b'abcd', self.make_fake_as(b'abcd'))
+        with self.assertRaises(VerificationError) as context:
+            verify_with_as('CAP\n', b'abcd', self.make_fake_as(b'abXd'))
+        self.assertEqual(2, context.exception.args[1])
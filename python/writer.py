@@ -0,0 +1,108 @@
+"""Write assembled programs as executable images.
+
+The image holds the code of each unit section, 1 to NUM_OF_UNITS in
+order. Each section is its length in words, as a 32-bit little-endian
+integer, followed by its words. Sections without code are written with
+a length of 0, so every image has the same number of sections.
+
+Where the layout comes from: the fields of each instruction word and
+their widths are the format letters documented in _op_code.py, packed
+from the top bit down in the order the format lists them (see
+encoder.py). The section lengths, the section order and the byte order
+are this writer's own choice. Nothing in this repository documents the
+image the as compiler writes, and no image has been compared with one
+yet. So the images in test/golden only pin down the layout described
+here. test_writer checks them word by word against instructions encoded
+by hand from the _op_code.py formats, not only against this writer.
+
+The image is built straight from the assembled sections. There is also
+a verification mode that still sends the listing through the as
+compiler packaged with the game, and checks that both give the same
+bytes. Its command line is not documented here either, so it is given
+as a template, see verify_with_as.
+"""
+
+
+__all__ = [
+    'as_arguments',
+    'image_bytes',
+    'verify_with_as',
+    'VerificationError',
+    'write_image',
+    ]
+
+
+import os
+import shlex
+import struct
+import subprocess
+import tempfile
+
+from defines import NUM_OF_UNITS
+
+
+_LENGTH = struct.Struct('<I')
+
+
+DEFAULT_AS_COMMAND = 'as {source} {output}'
+
+
+class VerificationError(Exception):
+    """The image does not match the one made by the as compiler."""
+
+
+def _iter_section_parts(results):
+    codes = {result.id: result.code for result in results}
+    for id in range(1, NUM_OF_UNITS + 1):
+        code = codes.get(id, b'')
+        yield _LENGTH.pack(len(code) // 4) + code
+
+
+def write_image(results, file):
+    """Write the image of the assembled sections to a binary file.
+
+    results: The assembler.SectionResult of each section.
+    """
+    for part in _iter_section_parts(results):
+        file.write(part)
+
+
+def image_bytes(results):
+    """Get the image of the assembled sections as bytes."""
+    return b''.join(_iter_section_parts(results))
+
+
+def as_arguments(as_command, source, output):
+    """Get the arguments to run the as compiler with.
+
+    as_command: A command line, where {source} and {output} stand for
+        the file as reads and the image it writes. Without either, it is
+        the as program, run as `as_command SOURCE OUTPUT`.
+    """
+    if '{source}' not in as_command and '{output}' not in as_command:
+        as_command = shlex.quote(as_command) + ' {source} {output}'
+    return [argument.format(source=source, output=output)
+            for argument in shlex.split(as_command)]
+
+
+def verify_with_as(listing, image, as_command=DEFAULT_AS_COMMAND):
+    """Check an image against the one the as compiler makes.
+
+    listing: The program as text, see assembler.write_listing.
+    image: The bytes of the image made by write_image.
+    as_command: The as command line, see as_arguments.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        source_path = os.path.join(temp_dir, 'source.vns')
+        output_path = os.path.join(temp_dir, 'output')
+        with open(source_path, 'w') as file:
+            file.write(listing)
+        subprocess.run(as_arguments(as_command, source_path, output_path),
+                       check=True, stdout=subprocess.DEVNULL)
+        with open(output_path, 'rb') as file:
+            expected = file.read()
+    if expected != image:
+        offset = next((index for index, (left, right) in
+                       enumerate(zip(expected, image)) if left != right),
+                      min(len(expected), len(image)))
+        raise VerificationError('Image differs from as output', offset)